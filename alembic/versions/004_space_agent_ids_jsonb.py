@@ -0,0 +1,65 @@
+"""Store space agent IDs as JSONB with a GIN index
+
+Revision ID: 004_agent_ids_jsonb
+Revises: 003_knowledge_bases
+Create Date: 2026-10-16
+
+This migration only runs on PostgreSQL (skipped for SQLite, which keeps
+the JSON string in a TEXT column).
+
+Changes:
+- Convert spaces.agent_ids from TEXT (JSON string) to JSONB
+- Create GIN index for "spaces containing agent X" lookups
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_agent_ids_jsonb'
+down_revision: Union[str, None] = '003_knowledge_bases'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def is_postgresql():
+    """Check if we're running against PostgreSQL"""
+    bind = op.get_bind()
+    return bind.dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Convert agent_ids to JSONB and index it"""
+    if not is_postgresql():
+        print("Skipping agent_ids JSONB conversion (not PostgreSQL)")
+        return
+
+    # Empty strings are not valid JSON; treat them as no agents
+    op.execute('''
+        ALTER TABLE spaces
+        ALTER COLUMN agent_ids TYPE jsonb
+        USING NULLIF(agent_ids, '')::jsonb
+    ''')
+
+    op.execute('''
+        CREATE INDEX IF NOT EXISTS ix_spaces_agent_ids_gin
+        ON spaces
+        USING gin (agent_ids)
+    ''')
+
+    print("spaces.agent_ids converted to JSONB with GIN index")
+
+
+def downgrade() -> None:
+    """Convert agent_ids back to a JSON string"""
+    if not is_postgresql():
+        return
+
+    op.execute('DROP INDEX IF EXISTS ix_spaces_agent_ids_gin')
+    op.execute('''
+        ALTER TABLE spaces
+        ALTER COLUMN agent_ids TYPE text
+        USING agent_ids::text
+    ''')
@@ -0,0 +1,50 @@
+"""Add composite indexes for message and activity listings
+
+Revision ID: 005_listing_indexes
+Revises: 004_agent_ids_jsonb
+Create Date: 2026-10-16
+
+This migration adds:
+- messages(space_id, timestamp) for per-space message history
+- activities(agent_id, created_at) and activities(job_id, created_at)
+  for the activity feed filters
+
+Both ascending and newest-first listings use these; B-tree indexes are
+scanned backwards for ORDER BY ... DESC.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_listing_indexes'
+down_revision: Union[str, None] = '004_agent_ids_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_messages_space_ts', 'messages', ['space_id', 'timestamp']),
+    ('ix_activities_agent_ts', 'activities', ['agent_id', 'created_at']),
+    ('ix_activities_job_ts', 'activities', ['job_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    """Create listing indexes"""
+    for name, table, columns in INDEXES:
+        try:
+            op.create_index(name, table, columns)
+        except Exception as e:
+            print(f"Note: index {name} may already exist: {e}")
+
+
+def downgrade() -> None:
+    """Drop listing indexes"""
+    for name, table, _ in reversed(INDEXES):
+        try:
+            op.drop_index(name, table_name=table)
+        except Exception:
+            pass
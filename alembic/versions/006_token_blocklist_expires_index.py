@@ -0,0 +1,36 @@
+"""Index token_blocklist.expires_at for expired-token cleanup
+
+Revision ID: 006_blocklist_expiry
+Revises: 005_listing_indexes
+Create Date: 2026-10-16
+
+Expired entries are purged by scripts/cleanup_token_blocklist.py; this
+index makes that DELETE a range scan instead of a full table scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_blocklist_expiry'
+down_revision: Union[str, None] = '005_listing_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create expires_at index"""
+    try:
+        op.create_index('ix_token_blocklist_expires_at', 'token_blocklist', ['expires_at'])
+    except Exception as e:
+        print(f"Note: index may already exist: {e}")
+
+
+def downgrade() -> None:
+    """Drop expires_at index"""
+    try:
+        op.drop_index('ix_token_blocklist_expires_at', table_name='token_blocklist')
+    except Exception:
+        pass
@@ -0,0 +1,51 @@
+"""Add indexes for task, notification, chunk and relation lookups
+
+Revision ID: 008_more_listing_indexes
+Revises: 006_blocklist_expiry
+Create Date: 2026-10-16
+
+This migration adds:
+- notifications(user_id, is_read, is_dismissed, scheduled_for)
+- tasks(space_id, status, due_date) and tasks(parent_task_id, position)
+- document_chunks(document_id, chunk_index)
+- relations(source_entity_id) and relations(target_entity_id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_more_listing_indexes'
+down_revision: Union[str, None] = '006_blocklist_expiry'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_notif_user_unread', 'notifications', ['user_id', 'is_read', 'is_dismissed', 'scheduled_for']),
+    ('ix_task_space_status_due', 'tasks', ['space_id', 'status', 'due_date']),
+    ('ix_task_parent_pos', 'tasks', ['parent_task_id', 'position']),
+    ('ix_chunk_doc_idx', 'document_chunks', ['document_id', 'chunk_index']),
+    ('ix_relations_source_entity_id', 'relations', ['source_entity_id']),
+    ('ix_relations_target_entity_id', 'relations', ['target_entity_id']),
+]
+
+
+def upgrade() -> None:
+    """Create lookup indexes"""
+    for name, table, columns in INDEXES:
+        try:
+            op.create_index(name, table, columns)
+        except Exception as e:
+            print(f"Note: index {name} may already exist: {e}")
+
+
+def downgrade() -> None:
+    """Drop lookup indexes"""
+    for name, table, _ in reversed(INDEXES):
+        try:
+            op.drop_index(name, table_name=table)
+        except Exception:
+            pass
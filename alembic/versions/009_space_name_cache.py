@@ -0,0 +1,49 @@
+"""Add denormalized space_name_cache to tasks and notifications
+
+Revision ID: 009_space_name_cache
+Revises: 008_more_listing_indexes
+Create Date: 2026-10-16
+
+Task and Notification listings show the space name on every row. The
+name is copied into space_name_cache (kept in sync by listeners in
+models.py) so listing them no longer loads each row's space. Existing
+rows are backfilled from spaces.name.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_space_name_cache'
+down_revision: Union[str, None] = '008_more_listing_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['tasks', 'notifications']
+
+
+def upgrade() -> None:
+    """Add and backfill space_name_cache"""
+    for table in TABLES:
+        try:
+            op.add_column(table, sa.Column('space_name_cache', sa.String(200), nullable=True))
+        except Exception as e:
+            print(f"Note: {table}.space_name_cache may already exist: {e}")
+
+        op.execute(
+            f"UPDATE {table} SET space_name_cache = "
+            f"(SELECT spaces.name FROM spaces WHERE spaces.id = {table}.space_id) "
+            f"WHERE space_id IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    """Remove space_name_cache"""
+    for table in reversed(TABLES):
+        try:
+            op.drop_column(table, 'space_name_cache')
+        except Exception:
+            pass
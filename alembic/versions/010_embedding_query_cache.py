@@ -0,0 +1,47 @@
+"""Add embedding_query_cache table
+
+Revision ID: 010_embedding_query_cache
+Revises: 009_space_name_cache
+Create Date: 2026-10-16
+
+Caches vector-search results keyed by a hash of the int8-quantized query
+embedding (see EmbeddingQueryCache), so repeated queries skip the
+nearest-neighbour search. last_used_at is indexed for LRU eviction.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_embedding_query_cache'
+down_revision: Union[str, None] = '009_space_name_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create embedding_query_cache"""
+    try:
+        op.create_table(
+            'embedding_query_cache',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('query_hash', sa.LargeBinary(16), nullable=False, unique=True),
+            sa.Column('results', sa.Text(), nullable=False),
+            sa.Column('hit_count', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_embedding_query_cache_last_used_at', 'embedding_query_cache', ['last_used_at'])
+    except Exception as e:
+        print(f"Note: embedding_query_cache may already exist: {e}")
+
+
+def downgrade() -> None:
+    """Drop embedding_query_cache"""
+    try:
+        op.drop_index('ix_embedding_query_cache_last_used_at', table_name='embedding_query_cache')
+        op.drop_table('embedding_query_cache')
+    except Exception:
+        pass
@@ -0,0 +1,38 @@
+"""Add int8-quantized embedding column to document_chunks
+
+Revision ID: 011_embedding_q8
+Revises: 010_embedding_query_cache
+Create Date: 2026-10-16
+
+The non-pgvector fallback now stores embeddings as int8 codes followed by
+a little-endian float32 scale in embedding_q8 (388 bytes for 384 dims,
+lossy; see DocumentChunk.set_embedding). The legacy JSON column stays
+readable until rows are re-embedded (scripts/regenerate_embeddings.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_embedding_q8'
+down_revision: Union[str, None] = '010_embedding_query_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add embedding_q8 column"""
+    try:
+        op.add_column('document_chunks', sa.Column('embedding_q8', sa.LargeBinary(), nullable=True))
+    except Exception as e:
+        print(f"Note: embedding_q8 column may already exist: {e}")
+
+
+def downgrade() -> None:
+    """Remove embedding_q8 column"""
+    try:
+        op.drop_column('document_chunks', 'embedding_q8')
+    except Exception:
+        pass
@@ -0,0 +1,75 @@
+"""Pack recurrence days into weekday bitmask columns
+
+Revision ID: 012_recurrence_days_mask
+Revises: 011_embedding_q8
+Create Date: 2026-10-16
+
+Adds tasks.recurrence_days_mask and task_templates.default_recurrence_days_mask
+(bit 0 = Monday ... bit 6 = Sunday) and packs the existing JSON day lists
+into them. The JSON columns are kept as a read-only fallback.
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_recurrence_days_mask'
+down_revision: Union[str, None] = '011_embedding_q8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    ('tasks', 'recurrence_days', 'recurrence_days_mask'),
+    ('task_templates', 'default_recurrence_days', 'default_recurrence_days_mask'),
+]
+
+
+def upgrade() -> None:
+    """Add mask columns and backfill them from the JSON day lists"""
+    bind = op.get_bind()
+
+    for table, json_column, mask_column in COLUMNS:
+        try:
+            op.add_column(table, sa.Column(mask_column, sa.SmallInteger(), nullable=True))
+        except Exception as e:
+            print(f"Note: {table}.{mask_column} may already exist: {e}")
+
+        rows = bind.execute(sa.text(
+            f"SELECT id, {json_column} FROM {table} WHERE {json_column} IS NOT NULL"
+        )).fetchall()
+        for row_id, raw in rows:
+            try:
+                days = json.loads(raw) or []
+                mask = 0
+                for day in days:
+                    mask |= 1 << int(day)
+            except (ValueError, TypeError):
+                continue
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {mask_column} = :mask, {json_column} = NULL WHERE id = :id"),
+                {'mask': mask & 0x7F, 'id': row_id}
+            )
+
+
+def downgrade() -> None:
+    """Unpack the masks back into JSON and drop the mask columns"""
+    bind = op.get_bind()
+
+    for table, json_column, mask_column in reversed(COLUMNS):
+        try:
+            rows = bind.execute(sa.text(
+                f"SELECT id, {mask_column} FROM {table} WHERE {mask_column} IS NOT NULL"
+            )).fetchall()
+            for row_id, mask in rows:
+                days = [day for day in range(7) if mask >> day & 1]
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET {json_column} = :days WHERE id = :id"),
+                    {'days': json.dumps(days), 'id': row_id}
+                )
+            op.drop_column(table, mask_column)
+        except Exception:
+            pass
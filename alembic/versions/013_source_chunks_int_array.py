@@ -0,0 +1,78 @@
+"""Store entity/relation source chunk IDs as int[] with GIN indexes
+
+Revision ID: 013_source_chunks_array
+Revises: 012_recurrence_days_mask
+Create Date: 2026-10-16
+
+This migration only runs on PostgreSQL (skipped for SQLite, which keeps
+the JSON string in a TEXT column).
+
+Changes:
+- Convert entities.source_chunks and relations.source_chunks from TEXT
+  (JSON string) to integer[]
+- Create GIN indexes for "entities/relations citing chunk X" lookups
+
+ALTER COLUMN ... USING cannot contain a subquery, so each column is
+rebuilt through a temporary column.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_source_chunks_array'
+down_revision: Union[str, None] = '012_recurrence_days_mask'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['entities', 'relations']
+
+
+def is_postgresql():
+    """Check if we're running against PostgreSQL"""
+    bind = op.get_bind()
+    return bind.dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Convert source_chunks to integer[] and index it"""
+    if not is_postgresql():
+        print("Skipping source_chunks int[] conversion (not PostgreSQL)")
+        return
+
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} ADD COLUMN source_chunks_ids integer[]')
+        # Empty strings are not valid JSON; treat them as no chunks
+        op.execute(f'''
+            UPDATE {table}
+            SET source_chunks_ids = ARRAY(
+                SELECT jsonb_array_elements_text(NULLIF(source_chunks, '')::jsonb)::integer
+            )
+            WHERE source_chunks IS NOT NULL
+        ''')
+        op.execute(f'ALTER TABLE {table} DROP COLUMN source_chunks')
+        op.execute(f'ALTER TABLE {table} RENAME COLUMN source_chunks_ids TO source_chunks')
+        op.execute(f'''
+            CREATE INDEX IF NOT EXISTS ix_{table}_source_chunks_gin
+            ON {table}
+            USING gin (source_chunks)
+        ''')
+
+    print("source_chunks converted to integer[] with GIN indexes")
+
+
+def downgrade() -> None:
+    """Convert source_chunks back to a JSON string"""
+    if not is_postgresql():
+        return
+
+    for table in reversed(TABLES):
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_source_chunks_gin')
+        op.execute(f'''
+            ALTER TABLE {table}
+            ALTER COLUMN source_chunks TYPE text
+            USING array_to_json(source_chunks)::text
+        ''')
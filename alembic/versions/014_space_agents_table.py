@@ -0,0 +1,92 @@
+"""Move space agent membership into a space_agents association table
+
+Revision ID: 014_space_agents
+Revises: 013_source_chunks_array
+Create Date: 2026-10-16
+
+Changes:
+- Create space_agents(space_id, agent_id, position) with an index on
+  agent_id for "spaces containing agent X" lookups
+- Copy each space's agent_ids list (JSONB on PostgreSQL, JSON text on
+  SQLite) into it, keeping the list order in position
+- Drop spaces.agent_ids and its GIN index
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014_space_agents'
+down_revision: Union[str, None] = '013_source_chunks_array'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def is_postgresql():
+    """Check if we're running against PostgreSQL"""
+    bind = op.get_bind()
+    return bind.dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Create space_agents from spaces.agent_ids"""
+    bind = op.get_bind()
+
+    op.create_table(
+        'space_agents',
+        sa.Column('space_id', sa.Integer(), sa.ForeignKey('spaces.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('agent_id', sa.Integer(), sa.ForeignKey('agents.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('position', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_space_agents_agent_id', 'space_agents', ['agent_id'])
+
+    agent_ids = {row[0] for row in bind.execute(sa.text('SELECT id FROM agents'))}
+    rows = []
+    for space_id, raw in bind.execute(sa.text('SELECT id, agent_ids FROM spaces WHERE agent_ids IS NOT NULL')):
+        try:
+            members = json.loads(raw) if isinstance(raw, str) else raw
+        except ValueError:
+            continue
+        for position, agent_id in enumerate(dict.fromkeys(int(a) for a in members or [])):
+            if agent_id in agent_ids:
+                rows.append({'space_id': space_id, 'agent_id': agent_id, 'position': position})
+    if rows:
+        bind.execute(
+            sa.text('INSERT INTO space_agents (space_id, agent_id, position) VALUES (:space_id, :agent_id, :position)'),
+            rows
+        )
+
+    if is_postgresql():
+        op.execute('DROP INDEX IF EXISTS ix_spaces_agent_ids_gin')
+    with op.batch_alter_table('spaces') as batch_op:
+        batch_op.drop_column('agent_ids')
+
+
+def downgrade() -> None:
+    """Restore spaces.agent_ids from space_agents"""
+    bind = op.get_bind()
+
+    with op.batch_alter_table('spaces') as batch_op:
+        batch_op.add_column(sa.Column('agent_ids', sa.Text(), nullable=True))
+
+    members = {}
+    for space_id, agent_id in bind.execute(sa.text(
+        'SELECT space_id, agent_id FROM space_agents ORDER BY space_id, position'
+    )):
+        members.setdefault(space_id, []).append(agent_id)
+    for space_id, agent_list in members.items():
+        bind.execute(
+            sa.text('UPDATE spaces SET agent_ids = :agent_ids WHERE id = :id'),
+            {'agent_ids': json.dumps(agent_list), 'id': space_id}
+        )
+
+    op.drop_index('ix_space_agents_agent_id', table_name='space_agents')
+    op.drop_table('space_agents')
+
+    # Back to the 004_agent_ids_jsonb layout
+    if is_postgresql():
+        op.execute("ALTER TABLE spaces ALTER COLUMN agent_ids TYPE jsonb USING NULLIF(agent_ids, '')::jsonb")
+        op.execute('CREATE INDEX IF NOT EXISTS ix_spaces_agent_ids_gin ON spaces USING gin (agent_ids)')
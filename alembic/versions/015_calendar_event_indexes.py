@@ -0,0 +1,49 @@
+"""Add calendar event indexes
+
+Revision ID: 015_calendar_indexes
+Revises: 014_space_agents
+Create Date: 2026-10-16
+
+This migration adds:
+- calendar_events(space_id, start_time) and calendar_events(start_time)
+  for range queries with and without a space filter
+- calendar_events(task_id) for a task's events
+- calendar_events(external_source, external_id) for sync lookups
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015_calendar_indexes'
+down_revision: Union[str, None] = '014_space_agents'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_cal_space_start', 'calendar_events', ['space_id', 'start_time']),
+    ('ix_cal_start', 'calendar_events', ['start_time']),
+    ('ix_cal_task', 'calendar_events', ['task_id']),
+    ('ix_cal_external', 'calendar_events', ['external_source', 'external_id']),
+]
+
+
+def upgrade() -> None:
+    """Create calendar event indexes"""
+    for name, table, columns in INDEXES:
+        try:
+            op.create_index(name, table, columns)
+        except Exception as e:
+            print(f"Note: index {name} may already exist: {e}")
+
+
+def downgrade() -> None:
+    """Drop calendar event indexes"""
+    for name, table, _ in reversed(INDEXES):
+        try:
+            op.drop_index(name, table_name=table)
+        except Exception:
+            pass
@@ -0,0 +1,70 @@
+"""Store calendar event and message JSON columns as JSONB
+
+Revision ID: 016_json_columns_jsonb
+Revises: 015_calendar_indexes
+Create Date: 2026-10-16
+
+This migration only runs on PostgreSQL (skipped for SQLite, which keeps
+the JSON string in a TEXT column).
+
+Changes:
+- Convert calendar_events.reminder_minutes and calendar_events.attendees
+  from TEXT (JSON string) to JSONB
+- Convert messages.mentions and messages.citations from TEXT (JSON
+  string) to JSONB
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '016_json_columns_jsonb'
+down_revision: Union[str, None] = '015_calendar_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [
+    ('calendar_events', 'reminder_minutes'),
+    ('calendar_events', 'attendees'),
+    ('messages', 'mentions'),
+    ('messages', 'citations'),
+]
+
+
+def is_postgresql():
+    """Check if we're running against PostgreSQL"""
+    bind = op.get_bind()
+    return bind.dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Convert JSON text columns to JSONB"""
+    if not is_postgresql():
+        print("Skipping JSONB conversion (not PostgreSQL)")
+        return
+
+    for table, column in COLUMNS:
+        # Empty strings are not valid JSON; treat them as NULL
+        op.execute(f'''
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE jsonb
+            USING NULLIF({column}, '')::jsonb
+        ''')
+
+    print("Calendar event and message JSON columns converted to JSONB")
+
+
+def downgrade() -> None:
+    """Convert JSONB columns back to JSON text"""
+    if not is_postgresql():
+        return
+
+    for table, column in reversed(COLUMNS):
+        op.execute(f'''
+            ALTER TABLE {table}
+            ALTER COLUMN {column} TYPE text
+            USING {column}::text
+        ''')
@@ -0,0 +1,47 @@
+"""Add calendar event check constraints
+
+Revision ID: 017_calendar_checks
+Revises: 016_json_columns_jsonb
+Create Date: 2026-10-16
+
+Changes:
+- Clamp existing events whose end_time is before start_time
+- Add CHECK constraints for end_time >= start_time and for the allowed
+  event_type and status values
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '017_calendar_checks'
+down_revision: Union[str, None] = '016_json_columns_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHECKS = [
+    ('ck_cal_time_order', 'end_time >= start_time'),
+    ('ck_cal_event_type', "event_type IN ('event', 'meeting', 'deadline', 'reminder', 'block')"),
+    ('ck_cal_status', "status IN ('confirmed', 'tentative', 'cancelled')"),
+]
+
+
+def upgrade() -> None:
+    """Create calendar event check constraints"""
+    # Rows written before the constraint may be out of order; make them zero-length
+    op.execute('UPDATE calendar_events SET end_time = start_time WHERE end_time < start_time')
+
+    # batch mode recreates the table on SQLite, which cannot ADD CONSTRAINT
+    with op.batch_alter_table('calendar_events') as batch_op:
+        for name, condition in CHECKS:
+            batch_op.create_check_constraint(name, condition)
+
+
+def downgrade() -> None:
+    """Drop calendar event check constraints"""
+    with op.batch_alter_table('calendar_events') as batch_op:
+        for name, _ in reversed(CHECKS):
+            batch_op.drop_constraint(name, type_='check')
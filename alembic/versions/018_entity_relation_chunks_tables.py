@@ -0,0 +1,113 @@
+"""Move entity/relation source chunks into association tables
+
+Revision ID: 018_source_chunk_tables
+Revises: 017_calendar_checks
+Create Date: 2026-10-16
+
+Changes:
+- Create entity_chunks(entity_id, chunk_id, position) and
+  relation_chunks(relation_id, chunk_id, position) with an index on
+  chunk_id for "entities/relations citing chunk X" lookups
+- Copy each row's source_chunks list (int[] on PostgreSQL, JSON text on
+  SQLite) into them, keeping the list order in position and dropping IDs
+  of chunks that no longer exist (they would violate the foreign key)
+- Drop entities.source_chunks and relations.source_chunks and their GIN
+  indexes
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '018_source_chunk_tables'
+down_revision: Union[str, None] = '017_calendar_checks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (owner table, association table, owner key column)
+TABLES = [
+    ('entities', 'entity_chunks', 'entity_id'),
+    ('relations', 'relation_chunks', 'relation_id'),
+]
+
+
+def is_postgresql():
+    """Check if we're running against PostgreSQL"""
+    bind = op.get_bind()
+    return bind.dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Create entity_chunks/relation_chunks from source_chunks"""
+    bind = op.get_bind()
+    chunk_ids = {row[0] for row in bind.execute(sa.text('SELECT id FROM document_chunks'))}
+
+    for table, link_table, key in TABLES:
+        op.create_table(
+            link_table,
+            sa.Column(key, sa.Integer(), sa.ForeignKey(f'{table}.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('chunk_id', sa.Integer(), sa.ForeignKey('document_chunks.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('position', sa.Integer(), nullable=False, server_default='0'),
+        )
+        op.create_index(f'ix_{link_table}_chunk_id', link_table, ['chunk_id'])
+
+        rows = []
+        for owner_id, raw in bind.execute(sa.text(f'SELECT id, source_chunks FROM {table} WHERE source_chunks IS NOT NULL')):
+            try:
+                chunks = json.loads(raw) if isinstance(raw, str) else raw
+            except ValueError:
+                continue
+            for position, chunk_id in enumerate(dict.fromkeys(int(c) for c in chunks or [])):
+                if chunk_id in chunk_ids:
+                    rows.append({key: owner_id, 'chunk_id': chunk_id, 'position': position})
+        if rows:
+            bind.execute(
+                sa.text(f'INSERT INTO {link_table} ({key}, chunk_id, position) VALUES (:{key}, :chunk_id, :position)'),
+                rows
+            )
+
+        if is_postgresql():
+            op.execute(f'DROP INDEX IF EXISTS ix_{table}_source_chunks_gin')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('source_chunks')
+
+
+def downgrade() -> None:
+    """Restore source_chunks from entity_chunks/relation_chunks"""
+    bind = op.get_bind()
+
+    for table, link_table, key in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('source_chunks', sa.Text(), nullable=True))
+
+        chunks = {}
+        for owner_id, chunk_id in bind.execute(sa.text(
+            f'SELECT {key}, chunk_id FROM {link_table} ORDER BY {key}, position'
+        )):
+            chunks.setdefault(owner_id, []).append(chunk_id)
+        for owner_id, chunk_list in chunks.items():
+            bind.execute(
+                sa.text(f'UPDATE {table} SET source_chunks = :source_chunks WHERE id = :id'),
+                {'source_chunks': json.dumps(chunk_list), 'id': owner_id}
+            )
+
+        op.drop_index(f'ix_{link_table}_chunk_id', table_name=link_table)
+        op.drop_table(link_table)
+
+        # Back to the 013_source_chunks_array layout
+        if is_postgresql():
+            op.execute(f'ALTER TABLE {table} ADD COLUMN source_chunks_ids integer[]')
+            op.execute(f'''
+                UPDATE {table}
+                SET source_chunks_ids = ARRAY(
+                    SELECT jsonb_array_elements_text(source_chunks::jsonb)::integer
+                )
+                WHERE source_chunks IS NOT NULL
+            ''')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN source_chunks')
+            op.execute(f'ALTER TABLE {table} RENAME COLUMN source_chunks_ids TO source_chunks')
+            op.execute(f'CREATE INDEX IF NOT EXISTS ix_{table}_source_chunks_gin ON {table} USING gin (source_chunks)')
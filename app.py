@@ -11,12 +11,13 @@ import logging
 import secrets
 from datetime import datetime, timedelta
 from flask import Flask, render_template, jsonify, request, redirect, url_for, session
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity, get_jwt, create_access_token, create_refresh_token
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from models import db, User, Agent, Job, Activity, Space, Message, Document, DocumentChunk, Entity, Relation, Integration, Skill, Task, Notification, CalendarEvent, TaskTemplate, OAuthAccount, TokenBlocklist, KnowledgeBase, seed_integrations
+from models import db, User, Agent, Job, Activity, Space, Message, Document, DocumentChunk, Entity, Relation, EntityChunk, RelationChunk, Integration, Skill, Task, Notification, CalendarEvent, TaskTemplate, OAuthAccount, TokenBlocklist, KnowledgeBase, IdLoader, report_lazy_loads, seed_integrations
 from services.task_service import TaskService
 from services.calendar_service import CalendarService
 from services.notification_service import NotificationService
@@ -32,6 +33,12 @@ from skills.skill_parser import SkillParser, SkillParserError
 from werkzeug.utils import secure_filename
 import json
 
+# Fast JSON responses (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import configuration
 from config.settings import (
     DATABASE_URI, SECRET_KEY, DEBUG, IS_AZURE, IS_PRODUCTION,
@@ -61,8 +68,37 @@ logger.info(f"Database: {'PostgreSQL' if 'postgresql' in DATABASE_URI else 'SQLi
 logger.info(f"Vector Store: {'pgvector' if USE_PGVECTOR else 'ChromaDB'}")
 logger.info(f"Blob Storage: {'Azure Blob' if BLOB_STORAGE_ENABLED else 'Local'}")
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+
+    Encodes jsonify() responses with orjson. Output matches the default
+    provider (sorted keys; datetimes and other extra types go through
+    Flask's default handler). Pretty-printed (debug) responses and calls
+    with custom json options fall back to the stdlib encoder.
+    """
+
+    def dumps(self, obj, **kwargs):
+        # Compact separators are what orjson emits anyway
+        if kwargs.get('separators') == (',', ':'):
+            del kwargs['separators']
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+if orjson:
+    app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = SECRET_KEY
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -91,6 +127,10 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 db.init_app(app)
 CORS(app)
 
+# Surface N+1 lazy loads in development logs
+if DEBUG:
+    report_lazy_loads(app)
+
 # Import vector store based on configuration
 if USE_PGVECTOR:
     from vector_store_pgvector import get_vector_store
@@ -952,6 +992,9 @@ def get_spaces():
                 return (2, name)  # Alphabetical
 
         spaces.sort(key=space_sort_key)
+        # Load every space's master agent with a single query
+        for space in spaces:
+            space.prime_agents()
         spaces_list = [space.to_dict() for space in spaces]
 
         return jsonify({
@@ -994,9 +1037,11 @@ def create_space():
                     'message': 'Master agent not found'
                 }), 404
 
-        # Set agent IDs
-        agent_ids = data.get('agent_ids', [])
-        space.set_agents([int(aid) for aid in agent_ids])
+        # Set agent IDs, skipping unknown agents (as add_agents_to_space
+        # does) since space_agents rows must reference an existing agent
+        agent_ids = [int(aid) for aid in data.get('agent_ids', [])]
+        known_ids = {row.id for row in db.session.query(Agent.id).filter(Agent.id.in_(agent_ids))}
+        space.set_agents([aid for aid in agent_ids if aid in known_ids])
 
         # Save to database
         db.session.add(space)
@@ -1078,7 +1123,7 @@ def update_space(space_id):
                         'message': 'Master agent not found'
                     }), 404
 
-        space.updated_at = datetime.now()
+        space.updated_at = datetime.utcnow()
 
         db.session.commit()
 
@@ -1156,7 +1201,7 @@ def add_agents_to_space(space_id):
 
         # Update space
         space.set_agents(existing_ids)
-        space.updated_at = datetime.now()
+        space.updated_at = datetime.utcnow()
 
         db.session.commit()
 
@@ -1191,7 +1236,7 @@ def remove_agent_from_space(space_id, agent_id):
 
         # Update space
         space.set_agents(agent_ids)
-        space.updated_at = datetime.now()
+        space.updated_at = datetime.utcnow()
 
         db.session.commit()
 
@@ -1580,6 +1625,7 @@ def get_jobs():
     """Get all jobs"""
     try:
         jobs = Job.query.order_by(Job.created_at.desc()).all()
+        IdLoader.for_request(Agent).prime(job.agent_id for job in jobs)
         jobs_list = [job.to_dict() for job in jobs]
 
         return jsonify({
@@ -1763,8 +1809,8 @@ def get_activities():
         status = request.args.get('status')
         limit = request.args.get('limit', 50, type=int)
 
-        # Build query
-        query = Activity.query
+        # Build query (agent/job names are eager-loaded for to_dict)
+        query = Activity.query_with_names()
 
         if agent_id:
             query = query.filter_by(agent_id=agent_id)
@@ -2237,16 +2283,19 @@ def get_integrations():
     """Get all integrations"""
     try:
         category = request.args.get('category')
+        summary = request.args.get('summary', 'false').lower() == 'true'
 
         query = Integration.query
         if category:
             query = query.filter_by(category=category)
+        if summary:
+            query = query.options(*Integration.summary_options())
 
         integrations = query.order_by(Integration.category, Integration.display_name).all()
 
         return jsonify({
             'success': True,
-            'integrations': [i.to_dict() for i in integrations]
+            'integrations': [i.to_summary() if summary else i.to_dict() for i in integrations]
         })
 
     except Exception as e:
@@ -2679,6 +2728,7 @@ def get_skills():
     """Get all skills"""
     try:
         skills = Skill.query.all()
+        IdLoader.for_request(Agent).prime(s.agent_id for s in skills)
         return jsonify({
             'success': True,
             'skills': [s.to_dict() for s in skills]
@@ -2962,6 +3012,7 @@ def get_agent_skills(agent_id):
 
         # Combine and deduplicate
         all_skills = agent_skills + global_skills
+        IdLoader.for_request(Agent).prime(s.agent_id for s in all_skills)
 
         return jsonify({
             'success': True,
@@ -3116,6 +3167,7 @@ def get_all_knowledge_bases():
     """Get all knowledge bases"""
     try:
         kbs = KnowledgeBase.query.all()
+        IdLoader.for_request(Space).prime(kb.space_id for kb in kbs)
         return jsonify({
             'success': True,
             'knowledge_bases': [kb.to_dict() for kb in kbs]
@@ -3391,53 +3443,52 @@ def upload_document():
         try:
             processor = get_processor()
 
-            # Extract text
-            text_content, metadata = processor.extract_text(file_path)
+            # Extract, chunk and analyze the document
+            processed = processor.process_document(file_path)
+            text_content = processed['text']
             document.content = text_content
 
-            # Chunk text
-            chunks = processor.chunk_text(text_content, metadata)
-
-            # Save chunks
-            for chunk_data in chunks:
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    chunk_index=chunk_data['chunk_index'],
-                    content=chunk_data['content'],
-                    token_count=chunk_data['token_count'],
-                    chunk_metadata=json.dumps(chunk_data['metadata'])
-                )
-                db.session.add(chunk)
-
-            # Extract entities
-            entities = processor.extract_entities(text_content)
-            entity_map = {}
-
-            for entity_data in entities:
-                entity = Entity(
-                    name=entity_data['name'],
-                    entity_type=entity_data['type'],
-                    mention_count=entity_data['mentions'],
-                    source_chunks=json.dumps([])  # Will be updated later
-                )
-                db.session.add(entity)
-                entity_map[entity_data['name']] = entity
-
-            # Extract relations
-            relations = processor.extract_relations(text_content, entities)
-
-            for relation_data in relations:
-                source_entity = entity_map.get(relation_data['source'])
-                target_entity = entity_map.get(relation_data['target'])
-
-                if source_entity and target_entity:
-                    relation = Relation(
-                        source_entity_id=source_entity.id,
-                        target_entity_id=target_entity.id,
-                        relation_type=relation_data['type'],
-                        confidence=relation_data['confidence']
-                    )
-                    db.session.add(relation)
+            chunks = processed['chunks']
+
+            # Save chunks (batched multi-row INSERTs)
+            DocumentChunk.bulk_create([
+                {
+                    'document_id': document.id,
+                    'chunk_index': chunk_data['chunk_index'],
+                    'content': chunk_data['content'],
+                    'token_count': chunk_data['token_count'],
+                    'chunk_metadata': chunk_data['metadata'],
+                }
+                for chunk_data in chunks
+            ])
+
+            # Save entities; RETURNING gives their IDs for the relations
+            entities = processed['entities']
+            entity_ids = Entity.bulk_create([
+                {
+                    'name': entity_data['name'],
+                    'entity_type': entity_data['type'],
+                    'mention_count': entity_data['mentions'],
+                }
+                for entity_data in entities
+            ], return_ids=True)
+            entity_map = {
+                entity_data['name']: entity_id
+                for entity_data, entity_id in zip(entities, entity_ids)
+            }
+
+            # Save relations
+            relations = processed['relations']
+            Relation.bulk_create([
+                {
+                    'source_entity_id': entity_map[relation_data['source']],
+                    'target_entity_id': entity_map[relation_data['target']],
+                    'relation_type': relation_data['type'],
+                    'confidence': relation_data['confidence'],
+                }
+                for relation_data in relations
+                if relation_data['source'] in entity_map and relation_data['target'] in entity_map
+            ])
 
             # Generate and store vector embeddings
             try:
@@ -3452,7 +3503,7 @@ def upload_document():
             document.status = 'completed'
             document.chunk_count = len(chunks)
             document.entity_count = len(entities)
-            document.processed_at = datetime.now()
+            document.processed_at = datetime.utcnow()
 
             db.session.commit()
 
@@ -3489,21 +3540,12 @@ def upload_document():
 def get_documents():
     """Get all documents with statistics"""
     try:
-        documents = Document.query.order_by(Document.uploaded_at.desc()).all()
-
-        documents_list = []
-        for doc in documents:
-            documents_list.append({
-                'id': doc.id,
-                'name': doc.name,
-                'file_type': doc.file_type,
-                'file_size': doc.file_size,
-                'status': doc.status,
-                'chunk_count': doc.chunk_count,
-                'entity_count': doc.entity_count,
-                'uploaded_at': doc.uploaded_at.isoformat() if doc.uploaded_at else None,
-                'processed_at': doc.processed_at.isoformat() if doc.processed_at else None
-            })
+        # Summary columns only: the extracted text never leaves the database
+        documents = (Document.query
+                     .options(*Document.summary_options())
+                     .order_by(Document.uploaded_at.desc())
+                     .all())
+        documents_list = [doc.to_summary() for doc in documents]
 
         # Calculate statistics
         total_chunks = db.session.query(db.func.count(DocumentChunk.id)).scalar()
@@ -3556,6 +3598,12 @@ def delete_document(doc_id):
         except Exception as e:
             logger.warning(f"Failed to delete embeddings: {e}")
 
+        # Unlink entities/relations from the document's chunks in two
+        # statements (SQLite does not enforce ON DELETE CASCADE)
+        chunk_ids = db.select(DocumentChunk.id).where(DocumentChunk.document_id == doc_id)
+        for link_model in (EntityChunk, RelationChunk):
+            link_model.query.filter(link_model.chunk_id.in_(chunk_ids)).delete(synchronize_session=False)
+
         # Delete document (cascade will delete chunks)
         db.session.delete(document)
         db.session.commit()
@@ -3736,12 +3784,12 @@ def scan_folder():
                         document_id=document.id,
                         chunk_index=chunk_data['chunk_index'],
                         content=chunk_data['content'],
-                        token_count=chunk_data['token_count'],
-                        chunk_metadata=json.dumps({
-                            'start_char': chunk_data.get('start_char', 0),
-                            'end_char': chunk_data.get('end_char', len(chunk_data['content']))
-                        })
+                        token_count=chunk_data['token_count']
                     )
+                    chunk.set_metadata({
+                        'start_char': chunk_data.get('start_char', 0),
+                        'end_char': chunk_data.get('end_char', len(chunk_data['content']))
+                    })
                     db.session.add(chunk)
 
                 # Create entity records
@@ -4029,17 +4077,19 @@ def list_tasks():
         status = request.args.get('status', type=str)
         priority = request.args.get('priority', type=str)
         limit = request.args.get('limit', 100, type=int)
+        summary = request.args.get('summary', 'false').lower() == 'true'
 
         tasks = TaskService.list_tasks(
             space_id=space_id,
             status_filter=status,
             priority_filter=priority,
-            limit=limit
+            limit=limit,
+            summary_only=summary
         )
 
         return jsonify({
             'success': True,
-            'tasks': [task.to_dict() for task in tasks],
+            'tasks': [task.to_summary() if summary else task.to_dict() for task in tasks],
             'count': len(tasks)
         })
 
@@ -4603,6 +4653,7 @@ def list_calendar_events():
         start_date = request.args.get('start_date', type=str)
         end_date = request.args.get('end_date', type=str)
         limit = request.args.get('limit', 100, type=int)
+        summary = request.args.get('summary', 'false').lower() == 'true'
 
         # Parse dates if provided
         start_dt = datetime.fromisoformat(start_date) if start_date else None
@@ -4614,12 +4665,13 @@ def list_calendar_events():
             event_type=event_type,
             start_date=start_dt,
             end_date=end_dt,
-            limit=limit
+            limit=limit,
+            summary_only=summary
         )
 
         return jsonify({
             'success': True,
-            'events': [e.to_dict() for e in events]
+            'events': [e.to_summary() if summary else e.to_dict() for e in events]
         })
     except Exception as e:
         logger.error(f"Error listing calendar events: {e}")
@@ -4633,6 +4685,7 @@ def get_calendar_events_range():
         start_date = request.args.get('start_date', type=str)
         end_date = request.args.get('end_date', type=str)
         space_id = request.args.get('space_id', type=int)
+        summary = request.args.get('summary', 'false').lower() == 'true'
 
         if not start_date or not end_date:
             return jsonify({'success': False, 'message': 'start_date and end_date are required'}), 400
@@ -4640,11 +4693,11 @@ def get_calendar_events_range():
         start_dt = datetime.fromisoformat(start_date)
         end_dt = datetime.fromisoformat(end_date)
 
-        events = CalendarService.get_events_for_range(start_dt, end_dt, space_id)
+        events = CalendarService.get_events_for_range(start_dt, end_dt, space_id, summary_only=summary)
 
         return jsonify({
             'success': True,
-            'events': [e.to_dict() for e in events]
+            'events': [e.to_summary() if summary else e.to_dict() for e in events]
         })
     except Exception as e:
         logger.error(f"Error getting calendar events range: {e}")
@@ -4799,18 +4852,20 @@ def list_notifications():
         notification_type = request.args.get('type', type=str)
         unread_only = request.args.get('unread_only', 'false').lower() == 'true'
         limit = request.args.get('limit', 50, type=int)
+        summary = request.args.get('summary', 'false').lower() == 'true'
 
         notifications = NotificationService.list_notifications(
             user_id=user_id,
             space_id=space_id,
             notification_type=notification_type,
             unread_only=unread_only,
-            limit=limit
+            limit=limit,
+            summary_only=summary
         )
 
         return jsonify({
             'success': True,
-            'notifications': [n.to_dict() for n in notifications]
+            'notifications': [n.to_summary() if summary else n.to_dict() for n in notifications]
         })
     except Exception as e:
         logger.error(f"Error listing notifications: {e}")
@@ -4988,17 +5043,19 @@ def list_task_templates():
         category = request.args.get('category', type=str)
         include_global = request.args.get('include_global', 'true').lower() == 'true'
         limit = request.args.get('limit', 100, type=int)
+        summary = request.args.get('summary', 'false').lower() == 'true'
 
         templates = TaskTemplateService.list_templates(
             space_id=space_id,
             category=category,
             include_global=include_global,
-            limit=limit
+            limit=limit,
+            summary_only=summary
         )
 
         return jsonify({
             'success': True,
-            'templates': [t.to_dict() for t in templates]
+            'templates': [t.to_summary() if summary else t.to_dict() for t in templates]
         })
     except Exception as e:
         logger.error(f"Error listing templates: {e}")
@@ -5251,7 +5308,7 @@ if __name__ == '__main__':
         db.create_all()
 
         # Ensure agents are seeded
-        if Agent.query.count() == 0:
+        if db.session.query(Agent.id).first() is None:
             print("[INFO] Database is empty, seeding agents...")
             from models import seed_agents
             seed_agents()
@@ -182,6 +182,9 @@ AGENT_CONFIG = {
     "max_tokens": 4096,
     "temperature": 0.7,
     "timeout": 60,  # seconds
+    "history_max_turns": 12,  # user/assistant pairs kept verbatim per agent
+    "history_summary_every": 4,  # evicted pairs folded into the summary at once
+    "summary_model": os.getenv("CLAUDE_SUMMARY_MODEL", CLAUDE_MODEL),  # set a cheaper model to cut summary cost
 }
 
 # Agent context paths
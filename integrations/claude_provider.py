@@ -7,6 +7,8 @@ from typing import List, Dict, Any, Optional
 import os
 import sys
 import logging
+import threading
+from collections import deque
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -21,6 +23,22 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# System prompts shorter than this are sent as plain strings; longer ones are
+# marked for Anthropic prompt caching so repeated turns reuse the prefix
+PROMPT_CACHE_MIN_CHARS = 1024
+PROMPT_CACHE_CONTROL = {"type": "ephemeral"}
+
+ACTIVE_SKILLS_HEADER = (
+    "\n\n# Active Skills for This Request\n"
+    "The following skills are relevant to the user's current request. Follow their instructions:\n"
+)
+
+SUMMARY_PROMPT = (
+    "Summarize the earlier part of this conversation in a few short bullet "
+    "points. Keep facts, decisions, goals and open questions the assistant "
+    "will need later. Do not add commentary."
+)
+
 
 class ClaudeProvider:
     """
@@ -28,6 +46,30 @@ class ClaudeProvider:
     Handles communication with Anthropic Claude API
     """
 
+    # Shared providers keyed by (model, api_key) so agents reuse connection pools
+    _instances: Dict[tuple, 'ClaudeProvider'] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, model: str = None, api_key: str = None) -> 'ClaudeProvider':
+        """
+        Get the process-wide provider for a model/API key pair
+
+        Args:
+            model: Claude model to use (default from settings)
+            api_key: Anthropic API key (default from environment)
+
+        Returns:
+            Shared ClaudeProvider instance
+        """
+        key = (model or CLAUDE_MODEL, api_key or ANTHROPIC_API_KEY)
+        with cls._instances_lock:
+            provider = cls._instances.get(key)
+            if provider is None:
+                provider = cls(model=key[0], api_key=key[1])
+                cls._instances[key] = provider
+        return provider
+
     def __init__(self, model: str = None, api_key: str = None):
         """
         Initialize Claude provider
@@ -49,6 +91,31 @@ class ClaudeProvider:
         self.max_tokens = AGENT_CONFIG.get('max_tokens', 4096)
         self.temperature = AGENT_CONFIG.get('temperature', 0.7)
 
+    @staticmethod
+    def _cacheable_system(system: str) -> Any:
+        """
+        Convert a long system prompt into a structured block marked for caching.
+
+        Short prompts are returned unchanged since they fall below the
+        minimum cacheable prefix length.
+        """
+        if len(system) <= PROMPT_CACHE_MIN_CHARS:
+            return system
+        return [{
+            'type': 'text',
+            'text': system,
+            'cache_control': PROMPT_CACHE_CONTROL,
+        }]
+
+    @staticmethod
+    def _cacheable_tools(tools: List[Dict]) -> List[Dict]:
+        """
+        Mark the last tool definition as a cache breakpoint.
+
+        The caller's list is left untouched; only the final tool is copied.
+        """
+        return tools[:-1] + [{**tools[-1], 'cache_control': PROMPT_CACHE_CONTROL}]
+
     def create_message(
         self,
         messages: List[Dict[str, str]],
@@ -69,18 +136,18 @@ class ClaudeProvider:
             Claude API response
         """
         params = {
-            'model': self.model,
+            'model': kwargs.get('model', self.model),
             'max_tokens': kwargs.get('max_tokens', self.max_tokens),
             'messages': messages,
         }
 
-        # Add system prompt if provided
+        # Add system prompt if provided (cached when long enough)
         if system:
-            params['system'] = system
+            params['system'] = self._cacheable_system(system)
 
-        # Add tools if provided
+        # Add tools if provided (cached alongside the system prompt)
         if tools:
-            params['tools'] = tools
+            params['tools'] = self._cacheable_tools(tools)
 
         # Add optional parameters
         if 'temperature' in kwargs:
@@ -112,18 +179,18 @@ class ClaudeProvider:
             Claude API response
         """
         params = {
-            'model': self.model,
+            'model': kwargs.get('model', self.model),
             'max_tokens': kwargs.get('max_tokens', self.max_tokens),
             'messages': messages,
         }
 
-        # Add system prompt if provided
+        # Add system prompt if provided (cached when long enough)
         if system:
-            params['system'] = system
+            params['system'] = self._cacheable_system(system)
 
-        # Add tools if provided
+        # Add tools if provided (cached alongside the system prompt)
         if tools:
-            params['tools'] = tools
+            params['tools'] = self._cacheable_tools(tools)
 
         # Add optional parameters
         if 'temperature' in kwargs:
@@ -155,16 +222,16 @@ class ClaudeProvider:
             Chunks of the response as they arrive
         """
         params = {
-            'model': self.model,
+            'model': kwargs.get('model', self.model),
             'max_tokens': kwargs.get('max_tokens', self.max_tokens),
             'messages': messages,
         }
 
         if system:
-            params['system'] = system
+            params['system'] = self._cacheable_system(system)
 
         if tools:
-            params['tools'] = tools
+            params['tools'] = self._cacheable_tools(tools)
 
         params['temperature'] = kwargs.get('temperature', self.temperature)
 
@@ -210,15 +277,31 @@ class ClaudeAgent:
         self.agent_id = agent_id
         self.skill_manager = skill_manager
 
-        # Initialize Claude provider
-        self.provider = ClaudeProvider(model=self.model)
+        # Shared Claude provider (one client/connection pool per model)
+        self.provider = ClaudeProvider.get(self.model)
 
-        # Conversation history (thread)
-        self.messages = []
+        # Conversation history (thread), bounded to the most recent turns
+        self.max_turns = AGENT_CONFIG.get('history_max_turns', 12)
+        self.messages = deque(maxlen=2 * self.max_turns)
+
+        # Older turns evicted from the window are folded into a running summary
+        # by a background thread, off the response path
+        self.summary_model = AGENT_CONFIG.get('summary_model') or self.model
+        self._evicted_messages = []
+        self._summary = None
+        self._summary_thread = None
 
         # Cache for active skills
         self._skills_cache = None
         self._skills_summary_cache = None
+        self._combined_instructions_cache = None
+
+        # Rendered "Active Skill" prompt blocks keyed by skill id
+        self._skill_blocks = {}
+
+        # Last skill-augmented prompt, reused while the relevant skills are unchanged
+        self._last_skill_ids: frozenset = frozenset()
+        self._last_system_prompt: str = ""
 
     @property
     def instructions(self) -> str:
@@ -229,14 +312,21 @@ class ClaudeAgent:
         if not self.agent_id or not self.skill_manager:
             return self.base_instructions
 
+        if self._combined_instructions_cache is not None:
+            return self._combined_instructions_cache
+
         try:
             # Get skill summaries if not cached
             if self._skills_summary_cache is None:
                 self._skills_summary_cache = self.skill_manager.get_skill_summaries(self.agent_id)
 
             if self._skills_summary_cache:
-                return f"{self.base_instructions}\n\n{self._skills_summary_cache}"
+                self._combined_instructions_cache = f"{self.base_instructions}\n\n{self._skills_summary_cache}"
+            else:
+                self._combined_instructions_cache = self.base_instructions
+            return self._combined_instructions_cache
         except Exception as e:
+            # Not cached, so the next call retries loading the summaries
             logger.warning(f"[{self.name}] Failed to load skill summaries: {e}")
 
         return self.base_instructions
@@ -245,6 +335,10 @@ class ClaudeAgent:
         """Refresh the skills cache - call when skills are updated"""
         self._skills_cache = None
         self._skills_summary_cache = None
+        self._combined_instructions_cache = None
+        self._skill_blocks = {}
+        self._last_skill_ids = frozenset()
+        self._last_system_prompt = ""
 
     def get_active_skills(self) -> List[Any]:
         """Get active skills for this agent"""
@@ -278,6 +372,98 @@ class ClaudeAgent:
             logger.warning(f"[{self.name}] Failed to detect skills: {e}")
             return []
 
+    def _append_user_message(self, content: str):
+        """
+        Add a user message to history, evicting the oldest turn if the window is full.
+
+        Eviction happens a full user/assistant pair at a time so the history
+        sent to Claude always starts with a user message.
+        """
+        if len(self.messages) >= self.messages.maxlen - 1:
+            self._evicted_messages.append(self.messages.popleft())
+            if self.messages and self.messages[0]['role'] == 'assistant':
+                self._evicted_messages.append(self.messages.popleft())
+
+        self.messages.append({
+            'role': 'user',
+            'content': content
+        })
+
+    def _summary_due(self) -> bool:
+        """Check whether enough turns have been evicted to summarize them"""
+        every = AGENT_CONFIG.get('history_summary_every', 4)
+        return len(self._evicted_messages) >= 2 * every
+
+    def _summary_request(self, evicted: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build the single-message transcript sent to the summary model"""
+        lines = []
+        if self._summary:
+            lines.append(f"Previous summary:\n{self._summary}\n")
+        for message in evicted:
+            lines.append(f"{message['role'].upper()}: {message['content']}")
+        lines.append(f"\n{SUMMARY_PROMPT}")
+        return [{'role': 'user', 'content': "\n".join(lines)}]
+
+    def _summarize_older(self, evicted: List[Dict[str, str]]):
+        """
+        Fold evicted turns into self._summary using the summary model.
+
+        Runs on a background thread started by _start_summary. On failure
+        the evicted turns are dropped so history stays bounded.
+        """
+        try:
+            response = self.provider.create_message(
+                messages=self._summary_request(evicted),
+                model=self.summary_model,
+                max_tokens=512,
+                temperature=0
+            )
+            # reset() may have cleared the conversation while this was running
+            if self._summary_thread is threading.current_thread():
+                self._summary = response.content[0].text
+        except Exception as e:
+            logger.warning(f"[{self.name}] Failed to summarize older turns: {e}")
+
+    def _start_summary(self):
+        """
+        Summarize evicted turns in the background once enough have piled up.
+
+        The reply being built does not wait for the summary; it is picked up
+        by the first request after the summary call returns. While one
+        summary is running, newly evicted turns wait for the next one.
+        """
+        if not self._summary_due():
+            return
+        if self._summary_thread is not None and self._summary_thread.is_alive():
+            return
+
+        evicted, self._evicted_messages = self._evicted_messages, []
+        self._summary_thread = threading.Thread(
+            target=self._summarize_older,
+            args=(evicted,),
+            name=f"{self.name}-summary",
+            daemon=True
+        )
+        self._summary_thread.start()
+
+    def _render_skill_block(self, skill: Any) -> str:
+        """
+        Get the prompt block for a skill, rendering it once per skill version.
+
+        Blocks are cached by skill id and re-rendered when updated_at changes.
+        """
+        skill_id = getattr(skill, 'id', None)
+        version = getattr(skill, 'updated_at', None)
+
+        cached = self._skill_blocks.get(skill_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        block = f"\n## Active Skill: {skill.display_name}\n{skill.content}"
+        if skill_id is not None:
+            self._skill_blocks[skill_id] = (version, block)
+        return block
+
     def _build_system_prompt_with_skills(self, input_text: str) -> str:
         """
         Build system prompt with relevant skill content injected.
@@ -285,20 +471,28 @@ class ClaudeAgent:
         For progressive disclosure: skill summaries are always present,
         but full skill content is only included when relevant to the message.
         """
-        system_prompt = self.instructions
-
         # Detect relevant skills for this specific message
         relevant_skills = self.detect_skills_for_message(input_text)
 
-        if relevant_skills:
-            skill_contents = []
-            for skill in relevant_skills:
-                skill_contents.append(f"\n## Active Skill: {skill.display_name}\n{skill.content}")
+        # Reuse the previous prompt when the same skills (and versions) apply
+        skill_ids = frozenset(
+            (getattr(skill, 'id', None), getattr(skill, 'updated_at', None))
+            for skill in relevant_skills
+        )
+        if skill_ids == self._last_skill_ids and self._last_system_prompt:
+            system_prompt = self._last_system_prompt
+        else:
+            parts = [self.instructions]
+            if relevant_skills:
+                parts.append(ACTIVE_SKILLS_HEADER)
+                parts.append("\n".join(self._render_skill_block(skill) for skill in relevant_skills))
+            system_prompt = "".join(parts)
+
+            self._last_skill_ids = skill_ids
+            self._last_system_prompt = system_prompt
 
-            if skill_contents:
-                system_prompt += "\n\n# Active Skills for This Request\n"
-                system_prompt += "The following skills are relevant to the user's current request. Follow their instructions:\n"
-                system_prompt += "\n".join(skill_contents)
+        if self._summary:
+            return f"{system_prompt}\n\n# Earlier Conversation Summary\n{self._summary}"
 
         return system_prompt
 
@@ -315,10 +509,8 @@ class ClaudeAgent:
         """
         try:
             # Add user message to history
-            self.messages.append({
-                'role': 'user',
-                'content': input_text
-            })
+            self._append_user_message(input_text)
+            self._start_summary()
 
             logger.info(f"[{self.name}] Processing user input: {input_text[:50]}...")
 
@@ -327,7 +519,7 @@ class ClaudeAgent:
 
             # Call Claude API
             response = self.provider.create_message(
-                messages=self.messages,
+                messages=list(self.messages),
                 system=system_prompt,
                 tools=self.tools if self.tools else None,
                 temperature=self.temperature
@@ -382,17 +574,15 @@ class ClaudeAgent:
             Agent response text
         """
         # Add user message to history
-        self.messages.append({
-            'role': 'user',
-            'content': input_text
-        })
+        self._append_user_message(input_text)
+        self._start_summary()
 
         # Build system prompt with skill injection
         system_prompt = self._build_system_prompt_with_skills(input_text)
 
         # Call Claude API asynchronously
         response = await self.provider.create_message_async(
-            messages=self.messages,
+            messages=list(self.messages),
             system=system_prompt,
             tools=self.tools if self.tools else None,
             temperature=self.temperature
@@ -411,11 +601,14 @@ class ClaudeAgent:
 
     def reset(self):
         """Clear conversation history"""
-        self.messages = []
+        self.messages.clear()
+        self._evicted_messages = []
+        self._summary = None
+        self._summary_thread = None
 
     def get_history(self) -> List[Dict]:
         """Get conversation history"""
-        return self.messages.copy()
+        return list(self.messages)
 
 
 # Test function
@@ -2,19 +2,50 @@
 Todoist Integration Helper
 Provides functions to fetch and manage Todoist tasks for agents
 """
+import io
+import asyncio
+import hashlib
 import requests
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 
+# Fast JSON decoding (optional)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Todoist API priority (4 = highest) to display label
+_PRIORITY_MAP = {4: "P1 (Urgent)", 3: "P2 (High)", 2: "P3 (Medium)", 1: "P4 (Low)"}
+_PRIORITY_SUFFIX = {priority: f" [{label}]" for priority, label in _PRIORITY_MAP.items()}
+
+# Precompiled line templates for format_tasks_for_context
+_TASK_TMPL = "  - {content}{prio}{due}{labels}\n".format
+_DESCRIPTION_TMPL = "    Description: {}...\n".format
+
 
 class TodoistHelper:
     """Helper class for Todoist API interactions"""
 
     BASE_URL = "https://api.todoist.com/rest/v2"
 
+    # Projects change rarely, so they are cached per API token for PROJECTS_TTL
+    # seconds, for at most PROJECTS_CACHE_SIZE tokens (least recently used are
+    # evicted). Shared by class because callers create a new helper per
+    # request; keyed by a SHA-256 of the token so the secret isn't retained.
+    PROJECTS_TTL = 300
+    PROJECTS_CACHE_SIZE = 128
+    _projects_cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _projects_lock = threading.Lock()
+
     def __init__(self, api_token: str):
         """
         Initialize Todoist helper with API token
@@ -23,6 +54,7 @@ class TodoistHelper:
             api_token: Todoist API token
         """
         self.api_token = api_token
+        self._cache_key = hashlib.sha256(api_token.encode()).hexdigest()
         self.headers = {
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json"
@@ -40,29 +72,58 @@ class TodoistHelper:
                 **kwargs
             )
             response.raise_for_status()
-            return response.json() if response.content else {}
-        except requests.exceptions.RequestException as e:
+            return _json_loads(response.content) if response.content else {}
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Todoist API error: {e}")
             return None
 
     def get_projects(self) -> List[Dict]:
-        """Get all projects"""
+        """Get all projects (cached for PROJECTS_TTL seconds)"""
+        now = time.monotonic()
+        with self._projects_lock:
+            cached = self._projects_cache.get(self._cache_key)
+            if cached is not None and now - cached[0] < self.PROJECTS_TTL:
+                self._projects_cache.move_to_end(self._cache_key)
+                # Fresh dicts so callers can't mutate the cached projects
+                return [dict(project) for project in cached[1]]
+
         result = self._make_request("GET", "projects")
-        return result if isinstance(result, list) else []
+        if not isinstance(result, list):
+            # Don't cache failures; retry on the next call
+            return []
+
+        with self._projects_lock:
+            self._projects_cache[self._cache_key] = (now, [dict(project) for project in result])
+            self._projects_cache.move_to_end(self._cache_key)
+            while len(self._projects_cache) > self.PROJECTS_CACHE_SIZE:
+                self._projects_cache.popitem(last=False)
+        return result
+
+    def invalidate_projects(self):
+        """Drop cached projects so the next get_projects call refetches"""
+        with self._projects_lock:
+            self._projects_cache.pop(self._cache_key, None)
 
     def get_tasks(
         self,
         project_id: Optional[str] = None,
         filter_query: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        label: Optional[str] = None,
+        ids: Optional[List[str]] = None
     ) -> List[Dict]:
         """
         Get tasks from Todoist
 
+        Filtering is done by the API; only `limit` is applied locally since
+        REST v2 has no page-size parameter.
+
         Args:
             project_id: Optional project ID to filter by
             filter_query: Optional Todoist filter query (e.g., "today", "overdue")
             limit: Maximum number of tasks to return
+            label: Optional label name to filter by
+            ids: Optional list of task IDs to fetch
 
         Returns:
             List of task dictionaries
@@ -73,6 +134,10 @@ class TodoistHelper:
             params["project_id"] = project_id
         if filter_query:
             params["filter"] = filter_query
+        if label:
+            params["label"] = label
+        if ids:
+            params["ids"] = ",".join(str(i) for i in ids)
 
         result = self._make_request("GET", "tasks", params=params)
         tasks = result if isinstance(result, list) else []
@@ -91,9 +156,12 @@ class TodoistHelper:
         """Get overdue tasks"""
         return self.get_tasks(filter_query="overdue")
 
-    def get_upcoming_tasks(self, days: int = 7) -> List[Dict]:
-        """Get tasks due in the next N days"""
-        return self.get_tasks(filter_query=f"due before: +{days} days")
+    def get_upcoming_tasks(self, days: int = 7, exclude_today: bool = False) -> List[Dict]:
+        """Get tasks due in the next N days, optionally leaving out today's"""
+        filter_query = f"due before: +{days} days"
+        if exclude_today:
+            filter_query += " & !today"
+        return self.get_tasks(filter_query=filter_query)
 
     def format_tasks_for_context(self, tasks: List[Dict], title: str = "Tasks") -> str:
         """
@@ -109,49 +177,71 @@ class TodoistHelper:
         if not tasks:
             return f"[{title}]\nNo tasks found.\n"
 
-        lines = [f"[{title}]"]
+        buf = io.StringIO()
+        buf.write(f"[{title}]\n")
 
         for task in tasks:
             # Get task details
             content = task.get("content", "Untitled")
             description = task.get("description", "")
-            priority = task.get("priority", 1)
             due = task.get("due")
-            project_id = task.get("project_id")
             labels = task.get("labels", [])
 
-            # Format priority
-            priority_map = {4: "P1 (Urgent)", 3: "P2 (High)", 2: "P3 (Medium)", 1: "P4 (Low)"}
-            priority_str = priority_map.get(priority, "")
-
             # Format due date
             due_str = ""
             if due:
-                due_date = due.get("date", "")
-                due_string = due.get("string", "")
+                due_string = due.get("string", "") or due.get("date", "")
                 if due_string:
                     due_str = f" | Due: {due_string}"
-                elif due_date:
-                    due_str = f" | Due: {due_date}"
-
-            # Format labels
-            labels_str = f" | Labels: {', '.join(labels)}" if labels else ""
-
-            # Build task line
-            line = f"  - {content}"
-            if priority_str:
-                line += f" [{priority_str}]"
-            if due_str:
-                line += due_str
-            if labels_str:
-                line += labels_str
+
+            buf.write(_TASK_TMPL(
+                content=content,
+                prio=_PRIORITY_SUFFIX.get(task.get("priority", 1), ""),
+                due=due_str,
+                labels=f" | Labels: {', '.join(labels)}" if labels else ""
+            ))
             if description:
-                line += f"\n    Description: {description[:100]}..."
+                buf.write(_DESCRIPTION_TMPL(description[:100]))
+
+        return buf.getvalue()
+
+    # ===================================
+    # Async variants (for use inside async agents / handlers)
+    # ===================================
+
+    async def aget_projects(self) -> List[Dict]:
+        """Get all projects (async)"""
+        return await asyncio.to_thread(self.get_projects)
+
+    async def aget_tasks(self, **kwargs) -> List[Dict]:
+        """Get tasks from Todoist (async); accepts the same arguments as get_tasks"""
+        return await asyncio.to_thread(self.get_tasks, **kwargs)
+
+    async def aget_today_tasks(self) -> List[Dict]:
+        """Get tasks due today (async)"""
+        return await self.aget_tasks(filter_query="today")
 
-            lines.append(line)
+    async def aget_overdue_tasks(self) -> List[Dict]:
+        """Get overdue tasks (async)"""
+        return await self.aget_tasks(filter_query="overdue")
 
-        lines.append("")  # Empty line at end
-        return "\n".join(lines)
+    async def aget_upcoming_tasks(self, days: int = 7, exclude_today: bool = False) -> List[Dict]:
+        """Get tasks due in the next N days (async)"""
+        return await asyncio.to_thread(self.get_upcoming_tasks, days, exclude_today)
+
+    async def aget_context_summary(self) -> str:
+        """
+        Get a comprehensive Todoist context summary for agents (async)
+
+        The underlying requests run concurrently in worker threads.
+        """
+        today_tasks, overdue_tasks, upcoming_tasks, projects = await asyncio.gather(
+            self.aget_today_tasks(),
+            self.aget_overdue_tasks(),
+            self.aget_upcoming_tasks(days=7, exclude_today=True),
+            self.aget_projects(),
+        )
+        return self._format_context_summary(today_tasks, overdue_tasks, upcoming_tasks, projects)
 
     def get_context_summary(self) -> str:
         """
@@ -160,27 +250,37 @@ class TodoistHelper:
         Returns:
             Formatted string with today's tasks, overdue, and upcoming
         """
-        sections = []
-
-        # Get today's tasks
+        # Get today's and overdue tasks. Two filters rather than one
+        # "today | overdue" request split locally: Todoist resolves both in
+        # the user's timezone and counts tasks whose due time has passed
+        # as overdue, which a server-side date comparison can't reproduce.
         today_tasks = self.get_today_tasks()
-        sections.append(self.format_tasks_for_context(today_tasks, "Today's Tasks"))
-
-        # Get overdue tasks
         overdue_tasks = self.get_overdue_tasks()
+
+        # Get upcoming tasks (next 7 days, excluding today - filtered by the API)
+        upcoming_tasks = self.get_upcoming_tasks(days=7, exclude_today=True)
+
+        projects = self.get_projects()
+
+        return self._format_context_summary(today_tasks, overdue_tasks, upcoming_tasks, projects)
+
+    def _format_context_summary(
+        self,
+        today_tasks: List[Dict],
+        overdue_tasks: List[Dict],
+        upcoming_tasks: List[Dict],
+        projects: List[Dict]
+    ) -> str:
+        """Format fetched tasks and projects into the agent context summary"""
+        sections = [self.format_tasks_for_context(today_tasks, "Today's Tasks")]
+
         if overdue_tasks:
             sections.append(self.format_tasks_for_context(overdue_tasks, "Overdue Tasks"))
 
-        # Get upcoming tasks (next 7 days, excluding today)
-        upcoming_tasks = self.get_upcoming_tasks(days=7)
-        # Filter out today's tasks from upcoming
-        today_ids = {t.get("id") for t in today_tasks}
-        upcoming_tasks = [t for t in upcoming_tasks if t.get("id") not in today_ids]
         if upcoming_tasks:
             sections.append(self.format_tasks_for_context(upcoming_tasks[:10], "Upcoming Tasks (Next 7 Days)"))
 
-        # Get project summary
-        projects = self.get_projects()
+        # Project summary
         if projects:
             project_lines = ["[Projects]"]
             for p in projects[:10]:
@@ -217,6 +317,35 @@ def get_todoist_context(api_token: str) -> Optional[str]:
         return None
 
 
+async def aget_todoist_context(api_token: str) -> Optional[str]:
+    """
+    Get Todoist context for agent consumption (async)
+
+    Use this instead of get_todoist_context inside async handlers so the
+    Todoist requests don't block the event loop.
+
+    Args:
+        api_token: Todoist API token
+
+    Returns:
+        Formatted context string or None if failed
+    """
+    try:
+        helper = TodoistHelper(api_token)
+        context = await helper.aget_context_summary()
+
+        if context:
+            return (
+                "\n--- TODOIST INTEGRATION DATA ---\n"
+                f"{context}"
+                "--- END TODOIST DATA ---\n"
+            )
+        return None
+    except Exception as e:
+        logger.error(f"Failed to get Todoist context: {e}")
+        return None
+
+
 def get_todoist_tasks_context(api_token: str, filter_type: str = "all") -> Optional[str]:
     """
     Get filtered Todoist tasks for agent consumption
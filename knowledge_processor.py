@@ -5,26 +5,133 @@ Handles document extraction, chunking, embedding, and entity extraction for Grap
 import os
 import re
 import json
+import mmap
+import bisect
+import hashlib
+import zipfile
+import functools
+import threading
+import xml.etree.ElementTree as ET
+from collections import Counter, OrderedDict
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator
 
-# Document processing
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
+import numpy as np
 
-try:
-    from docx import Document as DocxDocument
-except ImportError:
-    DocxDocument = None
+# Document processing and token counting backends are imported on first use
+# (see _get_pypdf, _get_docx_document, _get_tiktoken) so processes that never
+# ingest documents don't pay for them
 
-# Token counting
+# Multi-pattern entity matching
 try:
-    import tiktoken
+    import ahocorasick
 except ImportError:
-    tiktoken = None
+    ahocorasick = None
+
+
+# Potential proper nouns: 2-4 consecutive capitalized words
+_ENTITY_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
+_SENTENCE_END_RE = re.compile(r'[.!?]')
+
+
+@functools.lru_cache(maxsize=1)
+def _get_pypdf():
+    """Import the PDF backend (pypdf preferred; PyPDF2 is its deprecated predecessor)"""
+    try:
+        import pypdf
+    except ImportError:
+        try:
+            import PyPDF2 as pypdf
+        except ImportError:
+            raise ImportError("pypdf not installed. Run: pip install pypdf") from None
+    return pypdf
+
+
+@functools.lru_cache(maxsize=1)
+def _get_docx_document():
+    """Import python-docx's Document class"""
+    try:
+        from docx import Document
+    except ImportError:
+        raise ImportError("python-docx not installed. Run: pip install python-docx") from None
+    return Document
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tiktoken():
+    """Import tiktoken"""
+    try:
+        import tiktoken
+    except ImportError:
+        raise ImportError("tiktoken not installed. Run: pip install tiktoken") from None
+    return tiktoken
+
+
+# WordprocessingML tags used when streaming DOCX text
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = f'{_W_NS}p'
+_W_R = f'{_W_NS}r'
+# Run children that carry text. w:tab also defines tab stops in w:pPr/w:tabs,
+# so these are only read as direct children of a run (w:r).
+_W_TEXT = {f'{_W_NS}t': None, f'{_W_NS}tab': '\t', f'{_W_NS}br': '\n', f'{_W_NS}cr': '\n'}
+
+
+def _iter_docx_paragraphs(file_path: Path):
+    """
+    Stream paragraph text from a DOCX's document.xml without building a
+    python-docx object graph. Each paragraph is cleared once read, so
+    memory stays flat and nested (text box) paragraphs aren't repeated.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+        for _, elem in ET.iterparse(xml_file, events=('end',)):
+            if elem.tag != _W_P:
+                continue
+            parts = []
+            for run in elem.iter(_W_R):
+                for node in run:
+                    if node.tag in _W_TEXT:
+                        parts.append(_W_TEXT[node.tag] or node.text or '')
+            yield ''.join(parts)
+            elem.clear()
+
+
+# Token chunks are decoded this many at a time while streaming
+DECODE_BATCH_SIZE = 64
+
+# Results memoized by content hash so re-ingesting identical text is cheap
+MEMO_CACHE_SIZE = 256
+_chunk_cache = OrderedDict()
+_entity_cache = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def _memo_get(cache: OrderedDict, key):
+    """Look up a memoized result, marking it most recently used"""
+    with _memo_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _memo_put(cache: OrderedDict, key, value):
+    """Store a memoized result, evicting the least recently used entry"""
+    with _memo_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > MEMO_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_encoding(name: str = "cl100k_base"):
+    """Load a tiktoken encoding once per process and share it"""
+    return _get_tiktoken().get_encoding(name)
 
 
 class KnowledgeProcessor:
@@ -36,13 +143,34 @@ class KnowledgeProcessor:
         self.tokenizer = self._init_tokenizer()
 
     def _init_tokenizer(self):
-        """Initialize tiktoken tokenizer"""
-        if tiktoken:
-            try:
-                return tiktoken.get_encoding("cl100k_base")
-            except:
-                pass
-        return None
+        """Get the shared tiktoken tokenizer (None if tiktoken is unavailable)"""
+        try:
+            return _get_encoding()
+        except Exception:
+            return None
+
+    # ===================================
+    # Ingestion Pipeline
+    # ===================================
+
+    def process_document(self, file_path: str) -> Dict:
+        """
+        Extract, chunk and analyze a document in the calling process
+
+        Chunking and entity extraction go through the content-hash memo
+        caches, so re-ingesting identical text reuses the earlier results.
+        Returns: dict with text, metadata, chunks, entities and relations
+        """
+        text, metadata = self.extract_text(file_path)
+        entities = self.extract_entities(text)
+
+        return {
+            'text': text,
+            'metadata': metadata,
+            'chunks': self.chunk_text(text, metadata),
+            'entities': entities,
+            'relations': self.extract_relations(text, entities)
+        }
 
     # ===================================
     # Document Extraction
@@ -67,30 +195,46 @@ class KnowledgeProcessor:
 
     def extract_pdf(self, file_path: Path) -> Tuple[str, Dict]:
         """Extract text from PDF"""
-        if not PyPDF2:
-            raise ImportError("PyPDF2 not installed. Run: pip install PyPDF2")
+        pypdf = _get_pypdf()
 
-        text = []
-        metadata = {'pages': 0, 'extracted_method': 'PyPDF2'}
+        metadata = {'pages': 0, 'extracted_method': pypdf.__name__}
 
         try:
             with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+                pdf_reader = pypdf.PdfReader(file)
                 metadata['pages'] = len(pdf_reader.pages)
 
-                for page_num, page in enumerate(pdf_reader.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text)
+                # Pages are parsed lazily as they are iterated, one at a time
+                text = '\n\n'.join(
+                    page_text for page_text in (page.extract_text() for page in pdf_reader.pages)
+                    if page_text
+                )
 
-            return '\n\n'.join(text), metadata
+            return text, metadata
         except Exception as e:
             raise Exception(f"Failed to extract PDF: {str(e)}")
 
     def extract_docx(self, file_path: Path) -> Tuple[str, Dict]:
         """Extract text from DOCX"""
-        if not DocxDocument:
-            raise ImportError("python-docx not installed. Run: pip install python-docx")
+        try:
+            paragraph_count = 0
+            text = []
+            for paragraph_text in _iter_docx_paragraphs(file_path):
+                paragraph_count += 1
+                if paragraph_text.strip():
+                    text.append(paragraph_text)
+
+            metadata = {
+                'paragraphs': paragraph_count,
+                'extracted_method': 'docx-xml'
+            }
+
+            return '\n\n'.join(text), metadata
+        except (zipfile.BadZipFile, KeyError, ET.ParseError):
+            # Not a well-formed DOCX package; let python-docx have a go
+            pass
+
+        DocxDocument = _get_docx_document()
 
         try:
             doc = DocxDocument(file_path)
@@ -108,11 +252,21 @@ class KnowledgeProcessor:
     def extract_txt(self, file_path: Path) -> Tuple[str, Dict]:
         """Extract text from TXT/MD files"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
+            with open(file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    text = ''
+                else:
+                    # Decode straight from the mapped pages, skipping the
+                    # intermediate bytes copy that file.read() would make
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        text = str(mapped, 'utf-8')
+
+            # Match text-mode universal newline handling
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
 
             metadata = {
-                'lines': len(text.split('\n')),
+                'lines': text.count('\n') + 1,
                 'extracted_method': 'plain_text'
             }
 
@@ -132,80 +286,130 @@ class KnowledgeProcessor:
         if not text:
             return []
 
-        # Clean text
-        text = self._clean_text(text)
+        key = self._chunk_cache_key(text)
+        chunks = _memo_get(_chunk_cache, key)
 
-        # Use token-based chunking if tokenizer available
-        if self.tokenizer:
-            return self._chunk_by_tokens(text, metadata)
-        else:
-            return self._chunk_by_chars(text, metadata)
+        if chunks is None:
+            chunks = list(self._iter_chunks(self._clean_text(text)))
+            _memo_put(_chunk_cache, key, chunks)
 
-    def _chunk_by_tokens(self, text: str, metadata: Dict = None) -> List[Dict]:
-        """Chunk text by token count"""
-        tokens = self.tokenizer.encode(text)
-        chunks = []
+        # Fresh dicts so callers can't mutate the cached chunks
+        return [{**chunk, 'metadata': metadata or {}} for chunk in chunks]
 
-        start = 0
-        chunk_index = 0
+    def chunk_text_iter(self, text: str, metadata: Dict = None) -> Iterator[Dict]:
+        """
+        Split text into chunks with overlap, yielding each chunk as it is cut
 
-        while start < len(tokens):
-            end = start + self.chunk_size
-            chunk_tokens = tokens[start:end]
-            chunk_text = self.tokenizer.decode(chunk_tokens)
+        Lets callers embed/store chunk 0 while later chunks are still being
+        produced, keeping at most one batch of chunks in memory. Results are
+        not added to the chunk_text cache (that would need the full list),
+        but a cached result is reused if present.
+        """
+        if not text:
+            return
 
-            chunks.append({
-                'chunk_index': chunk_index,
-                'content': chunk_text.strip(),
-                'token_count': len(chunk_tokens),
-                'metadata': metadata or {}
-            })
+        chunks = _memo_get(_chunk_cache, self._chunk_cache_key(text))
+        if chunks is not None:
+            for chunk in chunks:
+                yield {**chunk, 'metadata': metadata or {}}
+            return
 
-            start = end - self.chunk_overlap
-            chunk_index += 1
+        yield from self._iter_chunks(self._clean_text(text), metadata)
 
-        return chunks
+    def _chunk_cache_key(self, text: str) -> Tuple:
+        return (_content_hash(text), self.chunk_size, self.chunk_overlap, self.tokenizer is not None)
 
-    def _chunk_by_chars(self, text: str, metadata: Dict = None) -> List[Dict]:
+    def _iter_chunks(self, text: str, metadata: Dict = None) -> Iterator[Dict]:
+        """Chunk already-cleaned text with the best available method"""
+        # Use token-based chunking if tokenizer available
+        if self.tokenizer:
+            return self._chunk_by_tokens(text, metadata)
+        return self._chunk_by_chars(text, metadata)
+
+    def _chunk_by_tokens(self, text: str, metadata: Dict = None) -> Iterator[Dict]:
+        """Chunk text by token count"""
+        # encode_ordinary skips the special-token scan (and doesn't raise on them)
+        tokens = self.tokenizer.encode_ordinary(text)
+        step = max(self.chunk_size - self.chunk_overlap, 1)
+        starts = range(0, len(tokens), step)
+
+        chunk_index = 0
+        for batch_start in range(0, len(starts), DECODE_BATCH_SIZE):
+            token_slices = [
+                tokens[start:start + self.chunk_size]
+                for start in starts[batch_start:batch_start + DECODE_BATCH_SIZE]
+            ]
+
+            # Decode a batch of chunks in a single call into the tokenizer
+            for chunk_tokens, chunk_text in zip(token_slices, self.tokenizer.decode_batch(token_slices)):
+                yield {
+                    'chunk_index': chunk_index,
+                    'content': chunk_text.strip(),
+                    'token_count': len(chunk_tokens),
+                    'metadata': metadata or {}
+                }
+                chunk_index += 1
+
+    def _chunk_by_chars(self, text: str, metadata: Dict = None) -> Iterator[Dict]:
         """Chunk text by character count (fallback)"""
         # Approximate tokens (rough estimate: 1 token ≈ 4 chars)
         char_chunk_size = self.chunk_size * 4
         char_overlap = self.chunk_overlap * 4
 
-        chunks = []
+        # Positions of every '. ' sentence break, found in one vectorized pass
+        # over the code points (so offsets match str indices)
+        code_points = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        periods = np.flatnonzero((code_points[:-1] == ord('.')) & (code_points[1:] == ord(' ')))
+        min_break = char_chunk_size * 0.7  # Break at least 70% into the chunk
+
         start = 0
         chunk_index = 0
 
         while start < len(text):
             end = start + char_chunk_size
-            chunk_text = text[start:end]
 
-            # Try to break at sentence boundary
+            # Try to break at the last sentence boundary inside the chunk
             if end < len(text):
-                last_period = chunk_text.rfind('. ')
-                if last_period > char_chunk_size * 0.7:  # At least 70% of chunk size
-                    chunk_text = chunk_text[:last_period + 1]
-                    end = start + last_period + 1
+                idx = np.searchsorted(periods, end - 1) - 1
+                if idx >= 0 and periods[idx] - start > min_break:
+                    end = int(periods[idx]) + 1
 
-            chunks.append({
+            chunk_text = text[start:end]
+
+            yield {
                 'chunk_index': chunk_index,
                 'content': chunk_text.strip(),
                 'token_count': self._estimate_tokens(chunk_text),
                 'metadata': metadata or {}
-            })
+            }
 
             start = end - char_overlap
             chunk_index += 1
 
-        return chunks
-
     def _clean_text(self, text: str) -> str:
-        """Clean and normalize text"""
-        # Remove multiple whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove multiple newlines
-        text = re.sub(r'\n\n+', '\n\n', text)
-        return text.strip()
+        """
+        Clean and normalize text, keeping paragraph breaks
+
+        Each line is stripped and its whitespace runs collapse to one space;
+        single line breaks are kept and runs of blank lines fold into one
+        paragraph break ('\n\n'). Equivalent to collapsing non-newline
+        whitespace runs to a space, trimming each line and folding three or
+        more newlines into two, but done with str.split/join so it runs in C.
+        """
+        paragraphs = []
+        current = []
+        for line in text.split('\n'):
+            line = ' '.join(line.split())
+            if line:
+                current.append(line)
+            elif current:
+                # Blank line ends the current paragraph
+                paragraphs.append('\n'.join(current))
+                current = []
+
+        if current:
+            paragraphs.append('\n'.join(current))
+        return '\n\n'.join(paragraphs)
 
     def _estimate_tokens(self, text: str) -> int:
         """Rough token count estimate"""
@@ -221,28 +425,29 @@ class KnowledgeProcessor:
         Basic entity extraction using patterns
         TODO: Enhance with NLP models (spaCy, etc.)
         """
-        entities = []
-
-        # Extract capitalized phrases (potential proper nouns)
-        # Pattern: 2-4 consecutive capitalized words
-        pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b'
-        matches = re.findall(pattern, text)
-
-        # Count occurrences
-        entity_counts = {}
-        for match in matches:
-            entity_counts[match] = entity_counts.get(match, 0) + 1
-
-        # Filter entities mentioned more than once
-        for entity, count in entity_counts.items():
-            if count > 1 and len(entity.split()) >= 2:
-                entities.append({
-                    'name': entity,
-                    'type': 'unknown',  # TODO: Add type classification
-                    'mentions': count
-                })
-
-        return entities
+        key = _content_hash(text)
+        entities = _memo_get(_entity_cache, key)
+
+        if entities is None:
+            # Extract and count capitalized phrases (potential proper nouns)
+            entities = self._entities_from_counts(Counter(_ENTITY_RE.findall(text)))
+            _memo_put(_entity_cache, key, entities)
+
+        # Fresh dicts so callers can't mutate the cached entities
+        return [dict(entity) for entity in entities]
+
+    def _entities_from_counts(self, entity_counts: Counter) -> List[Dict]:
+        """Build entity dicts from phrase counts"""
+        # Keep entities mentioned more than once (the pattern guarantees 2+ words)
+        return [
+            {
+                'name': entity,
+                'type': 'unknown',  # TODO: Add type classification
+                'mentions': count
+            }
+            for entity, count in entity_counts.items()
+            if count > 1
+        ]
 
     # ===================================
     # Relationship Extraction (Basic)
@@ -255,13 +460,42 @@ class KnowledgeProcessor:
         """
         relations = []
         entity_names = [e['name'] for e in entities]
-
-        # Look for entities mentioned in same sentence
-        sentences = re.split(r'[.!?]', text)
-
-        for sentence in sentences:
-            # Find which entities appear in this sentence
-            entities_in_sentence = [e for e in entity_names if e in sentence]
+        if len(entity_names) < 2:
+            return relations
+
+        # Sentence i ends at boundaries[i] (same split as re.split(r'[.!?]'))
+        boundaries = [m.start() for m in _SENTENCE_END_RE.finditer(text)]
+        sentence_entities = [set() for _ in range(len(boundaries) + 1)]
+        order = {name: i for i, name in enumerate(entity_names)}
+
+        # Find every entity mention in a single pass over the whole text,
+        # then bucket each mention into its sentence by offset
+        if ahocorasick:
+            automaton = ahocorasick.Automaton()
+            for name in entity_names:
+                automaton.add_word(name, name)
+            automaton.make_automaton()
+            mentions = ((end - len(name) + 1, name) for end, name in automaton.iter(text))
+        else:
+            # Lookahead finds the longest name at every offset; any shorter
+            # names that prefix it occur at the same offset and are added below
+            pattern = re.compile('(?=({}))'.format(
+                '|'.join(re.escape(name) for name in sorted(entity_names, key=len, reverse=True))
+            ))
+            mentions = ((m.start(), m.group(1)) for m in pattern.finditer(text))
+
+        # Entity indices implied by a match: the name plus any names prefixing it
+        implied = {
+            name: [order[name[:n]] for n in range(1, len(name) + 1) if name[:n] in order]
+            for name in entity_names
+        }
+
+        for position, name in mentions:
+            sentence_entities[bisect.bisect_left(boundaries, position)].update(implied[name])
+
+        for found in sentence_entities:
+            # Entities in this sentence, in entity order
+            entities_in_sentence = [entity_names[i] for i in sorted(found)]
 
             # Create relationships for entities in same sentence
             if len(entities_in_sentence) >= 2:
@@ -277,12 +511,7 @@ class KnowledgeProcessor:
         return relations
 
 
-# Singleton instance
-_processor = None
-
+@functools.lru_cache(maxsize=1)
 def get_processor():
     """Get or create knowledge processor instance"""
-    global _processor
-    if _processor is None:
-        _processor = KnowledgeProcessor()
-    return _processor
+    return KnowledgeProcessor()
@@ -4,18 +4,273 @@ Database schema for agents, jobs, activities, spaces, messages, and users
 Supports both SQLite (local development) and PostgreSQL with pgvector (production)
 """
 from flask_sqlalchemy import SQLAlchemy
+from flask import g, has_app_context, request
 from flask_login import UserMixin
+from sqlalchemy import insert, update, select, func, inspect, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import selectinload, joinedload, column_property, defer, undefer, load_only, raiseload
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 from pathlib import Path
-import json
+from operator import attrgetter
+import numpy as np
+import hashlib
 import os
+import re
+
+# Fast JSON for the JSON-in-TEXT columns (optional)
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+def _iso(value):
+    """ISO-format a datetime column value for to_dict, passing None through"""
+    return value.isoformat() if value else None
+
+
+def _load_json_column(instance, column, default):
+    """
+    Decode a JSON-in-TEXT column, caching the parsed value on the instance
+
+    The cache is keyed on the raw column string, so setters, direct
+    assignments and refreshes from the database all cause a re-parse.
+    Lists and dicts are returned as shallow copies since callers commonly
+    modify the result before passing it back to the setter.
+    """
+    raw = getattr(instance, column)
+    if not raw:
+        return default
+
+    cache = instance.__dict__.get('_json_column_cache')
+    if cache is None:
+        cache = instance._json_column_cache = {}
+
+    cached = cache.get(column)
+    if cached is None or cached[0] is not raw:
+        try:
+            cached = cache[column] = (raw, _json_loads(raw))
+        except (ValueError, TypeError):
+            return default
+
+    value = cached[1]
+    return value.copy() if isinstance(value, (list, dict)) else value
+
 
 db = SQLAlchemy()
 
+# Rows per executemany batch in bulk_create, to stay under driver/packet limits
+BULK_INSERT_BATCH_SIZE = 1000
+
+
+class BulkCreateMixin:
+    """Adds bulk_create for models whose rows are created in quantity"""
+
+    # JSON-in-TEXT columns that bulk_create encodes when given decoded values
+    JSON_COLUMNS = ()
+
+    @classmethod
+    def bulk_create(cls, rows, session=None, return_ids=False):
+        """
+        Insert many rows without building ORM objects
+
+        Rows are dicts keyed by column name and are sent as batched
+        multi-row INSERTs. Inserted rows are not loaded into the session.
+        With return_ids, each batch uses INSERT ... RETURNING so the new
+        IDs come back in the same round-trip, in input order.
+
+        Mapper events such as before_insert do not fire, so models whose
+        columns are filled by listeners (space_name_cache) don't use it.
+
+        Returns:
+            List of new IDs if return_ids, else the number of rows inserted
+        """
+        session = session or db.session
+        statement = insert(cls)
+        if return_ids:
+            statement = statement.returning(cls.id, sort_by_parameter_order=True)
+        ids = []
+        inserted = 0
+        batch = []
+
+        def flush_batch():
+            result = session.execute(statement, batch)
+            if return_ids:
+                ids.extend(result.scalars())
+            return len(batch)
+
+        for row in rows:
+            for column in cls.JSON_COLUMNS:
+                value = row.get(column)
+                if value is not None and not isinstance(value, str):
+                    row = {**row, column: _json_dumps(value)}
+            batch.append(row)
+
+            if len(batch) >= BULK_INSERT_BATCH_SIZE:
+                inserted += flush_batch()
+                batch = []
+
+        if batch:
+            inserted += flush_batch()
+        return ids if return_ids else inserted
+
+
+class SummaryMixin:
+    """Adds to_summary for list responses that only need scalar columns"""
+
+    # to_summary key -> column attribute; only plain columns, so building a
+    # summary never decodes JSON or touches a relationship
+    SUMMARY_FIELDS = {'id': 'id'}
+
+    @classmethod
+    def summary_options(cls):
+        """
+        Query options that load only the summary columns
+
+        Relationships are raiseload: to_summary never reads one, so an
+        access on a summary-loaded row is a bug that should fail loudly
+        rather than cost a query per row.
+        """
+        columns = [getattr(cls, name) for name in dict.fromkeys(cls.SUMMARY_FIELDS.values())]
+        return (load_only(*columns), raiseload('*'))
+
+    @classmethod
+    def _summary_layout(cls):
+        """
+        (keys, fetch, datetime_keys) for to_summary, built once per class
+
+        fetch is an attrgetter returning every summary column in one call;
+        datetime_keys are taken from the column types, so to_summary only
+        formats the fields that can hold a datetime.
+        """
+        layout = cls.__dict__.get('_summary_layout_cache')
+        if layout is None:
+            keys = tuple(cls.SUMMARY_FIELDS)
+            names = tuple(cls.SUMMARY_FIELDS.values())
+            fetch = attrgetter(*names)
+            if len(names) == 1:
+                fetch = lambda row, _get=fetch: (_get(row),)
+            columns = cls.__mapper__.columns
+            datetime_keys = tuple(key for key, name in cls.SUMMARY_FIELDS.items()
+                                  if isinstance(columns[name].type, db.DateTime))
+            layout = (keys, fetch, datetime_keys)
+            cls._summary_layout_cache = layout
+        return layout
+
+    def to_summary(self):
+        """Lightweight dict for list responses; use to_dict for detail views"""
+        keys, fetch, datetime_keys = self._summary_layout()
+        summary = dict(zip(keys, fetch(self)))
+        for key in datetime_keys:
+            summary[key] = _iso(summary[key])
+        return summary
+
+
+class IdLoader:
+    """
+    Request-scoped batch loader for one model's rows by primary key
+
+    List endpoints prime() the IDs their rows point at; the first get()
+    then loads every pending ID with a single IN query, and later lookups
+    are served from the loader. Un-primed IDs still cost one query each,
+    same as a lazy relationship load.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._pending = set()
+        self._loaded = {}
+
+    @classmethod
+    def for_request(cls, model):
+        """The loader for model on flask.g (a fresh one outside a request)"""
+        if not has_app_context():
+            return cls(model)
+        loaders = g.setdefault('_id_loaders', {})
+        if model not in loaders:
+            loaders[model] = cls(model)
+        return loaders[model]
+
+    def prime(self, ids):
+        """Register IDs to be fetched together on the next get()"""
+        self._pending.update(pk for pk in ids if pk is not None and pk not in self._loaded)
+        return self
+
+    def get(self, pk):
+        """Row with primary key pk, or None"""
+        if pk is None:
+            return None
+        if pk not in self._loaded:
+            self._pending.add(pk)
+            self._load_pending()
+        return self._loaded[pk]
+
+    def _load_pending(self):
+        ids, self._pending = self._pending, set()
+        rows = self.model.query.filter(self.model.id.in_(ids)).all()
+        self._loaded.update(dict.fromkeys(ids))
+        self._loaded.update((row.id, row) for row in rows)
+
+
+def _loaded_name(model, pk):
+    """name of the model row with primary key pk, via the request's IdLoader"""
+    row = IdLoader.for_request(model).get(pk)
+    return row.name if row else None
+
+
+def report_lazy_loads(app):
+    """
+    Log the relationship lazy loads each request triggers (development aid)
+
+    A lazy load inside a list loop is an N+1: the listing should eager-load
+    what to_dict reads. Loads are counted on flask.g by parent -> target
+    model and logged once when the request ends, so regressions show up in
+    the dev log without making on-demand loads in detail views fail.
+    """
+    @event.listens_for(db.session, 'do_orm_execute')
+    def _count_lazy_load(orm_execute_state):
+        # lazy_loaded_from raises for INSERT/UPDATE/DELETE statements
+        if not orm_execute_state.is_select:
+            return
+        parent = orm_execute_state.lazy_loaded_from
+        if parent is None or not has_app_context():
+            return
+        key = f'{parent.class_.__name__} -> {orm_execute_state.bind_mapper.class_.__name__}'
+        counts = g.setdefault('_lazy_loads', {})
+        counts[key] = counts.get(key, 0) + 1
+
+    @app.teardown_request
+    def _log_lazy_loads(exc):
+        counts = g.pop('_lazy_loads', None)
+        if counts:
+            summary = ', '.join(f'{key} x{count}' for key, count in sorted(counts.items()))
+            app.logger.warning(f"Lazy loads in {request.method} {request.path}: {summary}")
+
+
 # Check if we're using PostgreSQL with pgvector
 USE_PGVECTOR = os.getenv("USE_PGVECTOR", "false").lower() == "true"
 
+# JSONB on PostgreSQL (migration 016), JSON text elsewhere. The variant is
+# picked per dialect when statements compile, so it does not depend on
+# DATABASE_URL being in the environment when this module is imported.
+JSON_DOC_TYPE = db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), 'postgresql')
+
+
+def _get_json_doc(instance, column, default):
+    """Read a JSON_DOC_TYPE column (decoded on fetch), copying lists and dicts"""
+    value = getattr(instance, column)
+    if value is None:
+        return default
+    return value.copy() if isinstance(value, (list, dict)) else value
+
 # Conditionally import pgvector Vector type
 try:
     if USE_PGVECTOR:
@@ -26,6 +281,47 @@ try:
 except ImportError:
     VECTOR_TYPE = None
 
+# Weekday bitmask (bit 0 = Monday ... bit 6 = Sunday) -> sorted day list
+_WEEKDAYS_BY_MASK = tuple(tuple(day for day in range(7) if mask >> day & 1) for mask in range(128))
+
+
+def _weekday_mask(days):
+    """Pack weekday numbers (0=Mon, 6=Sun) into a 7-bit mask"""
+    mask = 0
+    for day in days or ():
+        mask |= 1 << int(day)
+    return mask & 0x7F
+
+
+# Float layout of the DocumentChunk.embedding_q8 scale and decoded embeddings
+EMBEDDING_DTYPE = np.dtype('<f4')
+
+
+def _quantize_int8(vector):
+    """
+    Symmetric int8 quantization with a per-vector scale
+
+    Returns:
+        (codes, scale) where codes * scale approximates the input
+    """
+    values = np.asarray(vector, dtype=EMBEDDING_DTYPE)
+    peak = float(np.abs(values).max()) if values.size else 0.0
+    if not peak:
+        return np.zeros(values.shape, dtype=np.int8), 0.0
+    scale = peak / 127
+    return np.round(values / scale).astype(np.int8), scale
+
+# Characters of chunk content shown in DocumentChunk.to_dict
+CONTENT_PREVIEW_CHARS = 200
+
+# argon2id password hashing (optional; falls back to Werkzeug's pbkdf2)
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+    _PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+except ImportError:
+    _PASSWORD_HASHER = None
+
 
 class User(UserMixin, db.Model):
     """User model for authentication"""
@@ -62,13 +358,33 @@ class User(UserMixin, db.Model):
 
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        if _PASSWORD_HASHER:
+            self.password_hash = _PASSWORD_HASHER.hash(password)
+        else:
+            self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
-        """Check password against hash"""
+        """Check password against hash (argon2id or legacy Werkzeug format)"""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+
+        if not self.password_hash.startswith('$argon2'):
+            if not check_password_hash(self.password_hash, password):
+                return False
+            # Upgrade legacy hashes on successful login; saved with the login commit
+            if _PASSWORD_HASHER:
+                self.password_hash = _PASSWORD_HASHER.hash(password)
+            return True
+
+        if not _PASSWORD_HASHER:
+            return False
+        try:
+            _PASSWORD_HASHER.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        if _PASSWORD_HASHER.check_needs_rehash(self.password_hash):
+            self.password_hash = _PASSWORD_HASHER.hash(password)
+        return True
 
     def is_locked(self):
         """Check if account is currently locked"""
@@ -118,8 +434,8 @@ class User(UserMixin, db.Model):
             'is_active': self.is_active,
             'is_admin': self.is_admin,
             'email_verified': self.email_verified,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
+            'created_at': _iso(self.created_at),
+            'last_login': _iso(self.last_login),
             'has_password': self.password_hash is not None,
             'oauth_providers': [acc.provider for acc in self.oauth_accounts] if self.oauth_accounts else []
         }
@@ -153,7 +469,7 @@ class OAuthAccount(db.Model):
             'id': self.id,
             'provider': self.provider,
             'provider_email': self.provider_email,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': _iso(self.created_at)
         }
 
     def __repr__(self):
@@ -169,7 +485,9 @@ class TokenBlocklist(db.Model):
     token_type = db.Column(db.String(20), nullable=False)  # access, refresh
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     revoked_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    # Indexed so the periodic purge of expired entries (scripts/cleanup_token_blocklist.py)
+    # is a range scan, keeping the table and its jti index small
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
     def __repr__(self):
         return f'<TokenBlocklist {self.jti[:8]}... ({self.token_type})>'
@@ -198,8 +516,8 @@ class Agent(db.Model):
             'type': self.type,
             'description': self.description,
             'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
         }
 
     def __repr__(self):
@@ -230,17 +548,17 @@ class Job(db.Model):
         return {
             'id': self.id,
             'agent_id': self.agent_id,
-            'agent_name': self.agent.name if self.agent else None,
+            'agent_name': _loaded_name(Agent, self.agent_id),
             'name': self.name,
             'description': self.description,
             'frequency': self.frequency,
             'cron_expression': self.cron_expression,
             'sop': self.sop,
             'status': self.status,
-            'last_run': self.last_run.isoformat() if self.last_run else None,
-            'next_run': self.next_run.isoformat() if self.next_run else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'last_run': _iso(self.last_run),
+            'next_run': _iso(self.next_run),
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
         }
 
     def __repr__(self):
@@ -260,24 +578,65 @@ class Activity(db.Model):
     status = db.Column(db.String(20), default='success')  # success, failed, warning
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Activity feeds filter by agent or job and list newest first
+    __table_args__ = (
+        db.Index('ix_activities_agent_ts', 'agent_id', 'created_at'),
+        db.Index('ix_activities_job_ts', 'job_id', 'created_at'),
+    )
+
+    @classmethod
+    def query_with_names(cls):
+        """Query with agent and job eager-loaded (to_dict reads both names)"""
+        return cls.query.options(selectinload(cls.agent), selectinload(cls.job))
+
+    @classmethod
+    def list_for_agent(cls, agent_id, limit=50):
+        """Get an agent's most recent activities, ready for to_dict"""
+        return (cls.query_with_names()
+                .filter_by(agent_id=agent_id)
+                .order_by(cls.created_at.desc())
+                .limit(limit)
+                .all())
+
     def to_dict(self):
+        agent, job = self.agent, self.job
         return {
             'id': self.id,
             'agent_id': self.agent_id,
-            'agent_name': self.agent.name if self.agent else None,
+            'agent_name': agent.name if agent else None,
             'job_id': self.job_id,
-            'job_name': self.job.name if self.job else None,
+            'job_name': job.name if job else None,
             'title': self.title,
             'summary': self.summary,
             'output_data': self.output_data,
             'status': self.status,
-            'created_at': self.created_at.isoformat(),
+            'created_at': _iso(self.created_at),
         }
 
     def __repr__(self):
         return f'<Activity {self.title}>'
 
 
+class SpaceAgent(db.Model):
+    """Agent membership of a space, in the space's agent order"""
+    __tablename__ = 'space_agents'
+
+    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id', ondelete='CASCADE'), primary_key=True)
+    agent_id = db.Column(db.Integer, db.ForeignKey('agents.id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    # "Spaces containing agent X" lookups (the primary key covers space_id)
+    __table_args__ = (
+        db.Index('ix_space_agents_agent_id', 'agent_id'),
+    )
+
+    # Joined: a membership row is only ever read for its agent
+    agent = db.relationship('Agent', lazy='joined')
+
+    def __repr__(self):
+        return f'<SpaceAgent space={self.space_id} agent={self.agent_id}>'
+
+
 class Space(db.Model):
     """Collaborative workspace for agents and users"""
     __tablename__ = 'spaces'
@@ -285,7 +644,6 @@ class Space(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    agent_ids = db.Column(db.Text)  # JSON string of agent IDs
     master_agent_id = db.Column(db.Integer, db.ForeignKey('agents.id'), nullable=True)  # Master agent for this space
 
     # Global space flag - when True, this space can access ALL knowledge bases
@@ -300,19 +658,34 @@ class Space(db.Model):
     messages = db.relationship('Message', backref='space', lazy=True, cascade='all, delete-orphan')
     master_agent = db.relationship('Agent', foreign_keys=[master_agent_id])
     owner = db.relationship('User', backref=db.backref('spaces', lazy=True))
+    # Selectin: to_dict lists the agents, so load memberships (and their
+    # agents) for every space in a result with one query
+    agent_links = db.relationship('SpaceAgent',
+                                  order_by=SpaceAgent.position,
+                                  lazy='selectin',
+                                  cascade='all, delete-orphan',
+                                  passive_deletes=True)
+
+    @classmethod
+    def with_agent(cls, agent_id):
+        """Get all spaces that include the given agent"""
+        return cls.query.join(SpaceAgent).filter(SpaceAgent.agent_id == agent_id).all()
 
     def get_agents(self):
         """Get list of agent IDs in this space"""
-        if not self.agent_ids:
-            return []
-        try:
-            return json.loads(self.agent_ids)
-        except:
-            return []
+        return [link.agent_id for link in self.agent_links]
 
     def set_agents(self, agent_list):
         """Set list of agent IDs for this space"""
-        self.agent_ids = json.dumps(agent_list)
+        # Keep existing membership rows so unchanged agents are updated in
+        # place rather than deleted and re-inserted
+        existing = {link.agent_id: link for link in self.agent_links}
+        links = []
+        for position, agent_id in enumerate(dict.fromkeys(int(a) for a in agent_list)):
+            link = existing.get(agent_id) or SpaceAgent(agent_id=agent_id)
+            link.position = position
+            links.append(link)
+        self.agent_links = links
 
     def get_accessible_knowledge_bases(self):
         """Get all knowledge bases accessible from this space"""
@@ -332,28 +705,34 @@ class Space(db.Model):
                 doc_ids.add(doc.id)
         return list(doc_ids)
 
+    def prime_agents(self):
+        """Register this space's master agent with the request's Agent IdLoader"""
+        return IdLoader.for_request(Agent).prime((self.master_agent_id,))
+
     def to_dict(self):
         """Convert space to dictionary with full agent details"""
-        agent_list = []
-        agent_ids = self.get_agents()
-
-        for agent_id in agent_ids:
-            agent = Agent.query.get(agent_id)
-            if agent:
-                agent_list.append({
-                    'id': agent.id,
-                    'name': agent.name,
-                    'tier': agent.type
-                })
+        # Member agents come with agent_links; the master agent is one IN
+        # query, unless the caller already primed it for a list of spaces
+        loader = self.prime_agents()
+
+        agent_list = [
+            {
+                'id': link.agent.id,
+                'name': link.agent.name,
+                'tier': link.agent.type
+            }
+            for link in self.agent_links if link.agent
+        ]
 
         # Get master agent info
         master_agent_info = None
-        if self.master_agent_id and self.master_agent:
+        master_agent = loader.get(self.master_agent_id)
+        if master_agent:
             master_agent_info = {
-                'id': self.master_agent.id,
-                'name': self.master_agent.name,
-                'tier': self.master_agent.type,
-                'description': self.master_agent.description
+                'id': master_agent.id,
+                'name': master_agent.name,
+                'tier': master_agent.type,
+                'description': master_agent.description
             }
 
         # Get knowledge base summary
@@ -371,8 +750,8 @@ class Space(db.Model):
             'is_global': self.is_global or False,
             'user_id': self.user_id,
             'knowledge_bases': kb_list,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
             'unread': 0  # TODO: Implement unread count
         }
 
@@ -391,35 +770,30 @@ class Message(db.Model):
     agent_name = db.Column(db.String(100))  # For agent messages
     agent_tier = db.Column(db.String(50))   # For agent messages
     content = db.Column(db.Text, nullable=False)
-    mentions = db.Column(db.Text)  # JSON string of mentioned agents
-    citations = db.Column(db.Text)  # JSON string of retrieved document sources
+    mentions = db.Column(JSON_DOC_TYPE)  # Mentioned agents
+    citations = db.Column(JSON_DOC_TYPE)  # Retrieved document sources
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Messages are always listed per space in timestamp order
+    __table_args__ = (
+        db.Index('ix_messages_space_ts', 'space_id', 'timestamp'),
+    )
+
     def get_mentions(self):
         """Get list of mentions"""
-        if not self.mentions:
-            return []
-        try:
-            return json.loads(self.mentions)
-        except:
-            return []
+        return _get_json_doc(self, 'mentions', [])
 
     def set_mentions(self, mentions_list):
         """Set list of mentions"""
-        self.mentions = json.dumps(mentions_list)
+        self.mentions = mentions_list
 
     def get_citations(self):
         """Get list of document citations"""
-        if not self.citations:
-            return []
-        try:
-            return json.loads(self.citations)
-        except:
-            return []
+        return _get_json_doc(self, 'citations', [])
 
     def set_citations(self, citations_list):
         """Set list of document citations"""
-        self.citations = json.dumps(citations_list)
+        self.citations = citations_list
 
     def to_dict(self):
         """Convert message to dictionary"""
@@ -428,7 +802,7 @@ class Message(db.Model):
             'role': self.role,
             'author': self.author,
             'content': self.content,
-            'timestamp': self.timestamp.isoformat()
+            'timestamp': _iso(self.timestamp)
         }
 
         # Add agent-specific fields
@@ -486,20 +860,31 @@ class KnowledgeBase(db.Model):
             'name': self.name,
             'description': self.description,
             'space_id': self.space_id,
-            'space_name': self.space.name if self.space else None,
+            'space_name': _loaded_name(Space, self.space_id),
             'is_default': self.is_default,
             'document_count': len(self.documents) if self.documents else 0,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
         }
 
     def __repr__(self):
         return f'<KnowledgeBase {self.name} (Space: {self.space_id})>'
 
 
-class Document(db.Model):
+class Document(SummaryMixin, db.Model):
     """Uploaded document for knowledge base"""
     __tablename__ = 'documents'
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'name': 'name',
+        'file_type': 'file_type',
+        'file_size': 'file_size',
+        'status': 'status',
+        'chunk_count': 'chunk_count',
+        'entity_count': 'entity_count',
+        'uploaded_at': 'uploaded_at',
+        'processed_at': 'processed_at',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
@@ -541,39 +926,45 @@ class Document(db.Model):
             'status': self.status,
             'chunks': self.chunk_count,
             'entities': self.entity_count,
-            'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
-            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
+            'uploaded_at': _iso(self.uploaded_at),
+            'processed_at': _iso(self.processed_at),
             'storage_type': self.storage_type,
             'blob_name': self.blob_name,
             'knowledge_bases': kb_list
         }
 
+    FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
     def format_file_size(self):
         """Format file size in human-readable format"""
         size = self.file_size
         if not size:
             return "Unknown"
 
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        # Each unit is 2**10 of the previous one, so the unit index is the
+        # bit length divided by 10 (capped at TB)
+        k = min(max((size.bit_length() - 1) // 10, 0), 4)
+        return f"{size / (1 << (10 * k)):.1f} {self.FILE_SIZE_UNITS[k]}"
 
     def __repr__(self):
         return f'<Document {self.name}>'
 
 
-class DocumentChunk(db.Model):
+class DocumentChunk(BulkCreateMixin, db.Model):
     """Text chunk from a document with embeddings"""
     __tablename__ = 'document_chunks'
+    JSON_COLUMNS = ('chunk_metadata',)
 
     id = db.Column(db.Integer, primary_key=True)
     document_id = db.Column(db.Integer, db.ForeignKey('documents.id'), nullable=False)
     chunk_index = db.Column(db.Integer, nullable=False)  # Order in document
     content = db.Column(db.Text, nullable=False)  # The actual text chunk
     token_count = db.Column(db.Integer)
-    embedding = db.Column(db.Text)  # JSON-serialized vector embedding (SQLite fallback)
+    # Start of content computed by the database (one extra char to detect
+    # truncation), so listings can skip transferring the full text
+    content_preview = column_property(func.substr(content, 1, CONTENT_PREVIEW_CHARS + 1), deferred=True)
+    embedding = db.Column(db.Text)  # Legacy JSON-serialized vector embedding (read-only fallback)
+    embedding_q8 = db.Column(db.LargeBinary)  # int8 codes + float32 scale (SQLite fallback), see set_embedding
     chunk_metadata = db.Column(db.Text)  # JSON metadata (page number, section, etc.)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -585,61 +976,212 @@ class DocumentChunk(db.Model):
     blob_name = db.Column(db.String(500))  # Azure Blob Storage reference
     filename = db.Column(db.String(255))  # Original filename for this chunk's document
 
+    # Chunks are always read per document in chunk order
+    __table_args__ = (
+        db.Index('ix_chunk_doc_idx', 'document_id', 'chunk_index'),
+    )
+
     def set_embedding(self, vector):
-        """Store embedding as JSON (SQLite) or update pgvector column (PostgreSQL)"""
+        """
+        Store embedding as int8 codes (SQLite) or update pgvector column (PostgreSQL)
+
+        The fallback format is lossy: each component is rounded to a multiple
+        of scale = max|v| / 127, so it is off by at most max|v| / 254. Cosine
+        similarity against the original stays above 0.9999 for 384-d
+        sentence embeddings, which is well below ranking noise.
+        """
         if USE_PGVECTOR and hasattr(self, 'embedding_vector'):
             # For pgvector, the embedding is stored directly
             self.embedding_vector = vector
         else:
-            # For SQLite, store as JSON string
-            self.embedding = json.dumps(vector)
+            # For SQLite, store int8 codes followed by the float32 scale
+            # (388 bytes for 384 dims vs 1.5 KB of float32 or ~7 KB of JSON)
+            codes, scale = _quantize_int8(vector)
+            self.embedding_q8 = codes.tobytes() + np.array(scale, dtype=EMBEDDING_DTYPE).tobytes()
+            self.embedding = None
+
+    def get_quantized_embedding(self):
+        """(int8 codes, scale) from embedding_q8, or None if not stored that way"""
+        if self.embedding_q8 is None:
+            return None
+        codes = np.frombuffer(self.embedding_q8, dtype=np.int8, count=len(self.embedding_q8) - 4)
+        scale = float(np.frombuffer(self.embedding_q8, dtype=EMBEDDING_DTYPE, offset=len(self.embedding_q8) - 4)[0])
+        return codes, scale
 
     def get_embedding(self):
-        """Retrieve embedding as list"""
+        """Retrieve embedding (float32 ndarray, dequantized on the SQLite fallback)"""
         if USE_PGVECTOR and hasattr(self, 'embedding_vector') and self.embedding_vector is not None:
             # pgvector returns numpy array or list
             emb = self.embedding_vector
             return list(emb) if hasattr(emb, '__iter__') else None
-        # Fall back to JSON column
-        return json.loads(self.embedding) if self.embedding else None
+        quantized = self.get_quantized_embedding()
+        if quantized is not None:
+            codes, scale = quantized
+            return codes.astype(EMBEDDING_DTYPE) * np.float32(scale)
+        # Fall back to legacy JSON column
+        legacy = _load_json_column(self, 'embedding', None)
+        return np.asarray(legacy, dtype=EMBEDDING_DTYPE) if legacy is not None else None
+
+    def has_embedding(self):
+        """Check for a stored embedding without decoding it"""
+        if USE_PGVECTOR and getattr(self, 'embedding_vector', None) is not None:
+            return True
+        return self.embedding_q8 is not None or bool(self.embedding)
 
     def set_metadata(self, data):
         """Store metadata as JSON"""
-        self.chunk_metadata = json.dumps(data)
+        self.chunk_metadata = _json_dumps(data)
 
     def get_metadata(self):
         """Retrieve metadata as dict"""
-        return json.loads(self.chunk_metadata) if self.chunk_metadata else {}
+        return _load_json_column(self, 'chunk_metadata', {})
+
+    @classmethod
+    def query_previews(cls):
+        """Query that loads content_preview instead of the full chunk text"""
+        return cls.query.options(defer(cls.content), undefer(cls.content_preview))
+
+    def get_preview(self):
+        """Content truncated to CONTENT_PREVIEW_CHARS, with '...' if cut"""
+        # Use the full text if it's already loaded, otherwise the SQL preview
+        text = self.content_preview if 'content' in inspect(self).unloaded else self.content
+        if len(text) <= CONTENT_PREVIEW_CHARS:
+            return text
+        return text[:CONTENT_PREVIEW_CHARS] + '...'
 
     def to_dict(self):
         return {
             'id': self.id,
             'document_id': self.document_id,
             'chunk_index': self.chunk_index,
-            'content': self.content[:200] + '...' if len(self.content) > 200 else self.content,
+            'content': self.get_preview(),
             'token_count': self.token_count,
             'metadata': self.get_metadata(),
-            'has_embedding': self.get_embedding() is not None
+            'has_embedding': self.has_embedding()
         }
 
     def __repr__(self):
         return f'<DocumentChunk {self.id} from Document {self.document_id}>'
 
 
-class Entity(db.Model):
+class EmbeddingQueryCache(db.Model):
+    """Recent vector-search results, keyed by the quantized query embedding"""
+    __tablename__ = 'embedding_query_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    query_hash = db.Column(db.LargeBinary(16), nullable=False, unique=True)  # See make_hash
+    results = db.Column(db.Text, nullable=False)  # JSON [[chunk_id, similarity], ...] in rank order
+    hit_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # LRU eviction
+
+    @staticmethod
+    def make_hash(vector, *params):
+        """
+        16-byte cache key for a query embedding and the search parameters
+
+        The embedding is quantized to int8 first, so reformulations whose
+        embeddings differ only in low-order bits share a key.
+        """
+        codes, _ = _quantize_int8(vector)
+        digest = hashlib.sha256(codes.tobytes())
+        digest.update(repr(params).encode())
+        return digest.digest()[:16]
+
+    @staticmethod
+    def encode_results(pairs):
+        """results column value for (chunk_id, similarity) pairs in rank order"""
+        return _json_dumps([[chunk_id, similarity] for chunk_id, similarity in pairs])
+
+    @staticmethod
+    def decode_results(raw):
+        """(chunk_id, similarity) pairs from a results column value"""
+        return [tuple(pair) for pair in _json_loads(raw)] if raw else []
+
+    def get_results(self):
+        """Cached (chunk_id, similarity) pairs in rank order"""
+        return [tuple(pair) for pair in _load_json_column(self, 'results', [])]
+
+    def set_results(self, pairs):
+        """Store (chunk_id, similarity) pairs in rank order"""
+        self.results = self.encode_results(pairs)
+
+    def __repr__(self):
+        return f'<EmbeddingQueryCache {self.query_hash.hex()} ({self.hit_count} hits)>'
+
+
+def _chunk_links(links, chunk_ids, link_model):
+    """Link rows for chunk_ids in the given order, reusing rows already in links"""
+    # Unchanged chunks are updated in place rather than deleted and re-inserted
+    existing = {link.chunk_id: link for link in links}
+    result = []
+    for position, chunk_id in enumerate(dict.fromkeys(int(c) for c in chunk_ids or [])):
+        link = existing.get(chunk_id) or link_model(chunk_id=chunk_id)
+        link.position = position
+        result.append(link)
+    return result
+
+
+class EntityChunk(db.Model):
+    """Chunk an entity was extracted from"""
+    __tablename__ = 'entity_chunks'
+
+    entity_id = db.Column(db.Integer, db.ForeignKey('entities.id', ondelete='CASCADE'), primary_key=True)
+    chunk_id = db.Column(db.Integer, db.ForeignKey('document_chunks.id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    # "Entities citing chunk X" lookups (the primary key covers entity_id)
+    __table_args__ = (
+        db.Index('ix_entity_chunks_chunk_id', 'chunk_id'),
+    )
+
+    def __repr__(self):
+        return f'<EntityChunk entity={self.entity_id} chunk={self.chunk_id}>'
+
+
+class RelationChunk(db.Model):
+    """Chunk a relation was found in"""
+    __tablename__ = 'relation_chunks'
+
+    relation_id = db.Column(db.Integer, db.ForeignKey('relations.id', ondelete='CASCADE'), primary_key=True)
+    chunk_id = db.Column(db.Integer, db.ForeignKey('document_chunks.id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    # "Relations citing chunk X" lookups (the primary key covers relation_id)
+    __table_args__ = (
+        db.Index('ix_relation_chunks_chunk_id', 'chunk_id'),
+    )
+
+    def __repr__(self):
+        return f'<RelationChunk relation={self.relation_id} chunk={self.chunk_id}>'
+
+
+class Entity(BulkCreateMixin, SummaryMixin, db.Model):
     """Extracted entity from knowledge graph"""
     __tablename__ = 'entities'
+    JSON_COLUMNS = ('properties',)
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'name': 'name',
+        'type': 'entity_type',
+        'mention_count': 'mention_count',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     entity_type = db.Column(db.String(50))  # person, organization, location, concept, etc.
     description = db.Column(db.Text)
     properties = db.Column(db.Text)  # JSON-serialized properties
-    source_chunks = db.Column(db.Text)  # JSON list of chunk IDs
     mention_count = db.Column(db.Integer, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Source chunk IDs in stored order; only the link rows are loaded, on access
+    chunk_links = db.relationship('EntityChunk',
+                                  order_by=EntityChunk.position,
+                                  lazy=True,
+                                  cascade='all, delete-orphan')
+
     # Relationships for outgoing relations
     outgoing_relations = db.relationship('Relation',
                                         foreign_keys='Relation.source_entity_id',
@@ -656,23 +1198,34 @@ class Entity(db.Model):
 
     def set_properties(self, props):
         """Store properties as JSON"""
-        import json
-        self.properties = json.dumps(props)
+        self.properties = _json_dumps(props)
 
     def get_properties(self):
         """Retrieve properties as dict"""
-        import json
-        return json.loads(self.properties) if self.properties else {}
+        return _load_json_column(self, 'properties', {})
 
-    def set_source_chunks(self, chunks):
-        """Store source chunk IDs as JSON"""
-        import json
-        self.source_chunks = json.dumps(chunks)
+    def set_source_chunks(self, chunk_ids):
+        """Store source chunk IDs, keeping their order"""
+        self.chunk_links = _chunk_links(self.chunk_links, chunk_ids, EntityChunk)
 
     def get_source_chunks(self):
         """Retrieve source chunk IDs as list"""
-        import json
-        return json.loads(self.source_chunks) if self.source_chunks else []
+        return [link.chunk_id for link in self.chunk_links]
+
+    @classmethod
+    def citing_chunk(cls, chunk_id):
+        """Entities extracted from chunk_id"""
+        return cls.query.join(EntityChunk).filter(EntityChunk.chunk_id == chunk_id).all()
+
+    @classmethod
+    def in_document(cls, document_id):
+        """Entities extracted from any chunk of a document"""
+        return (cls.query
+                .join(EntityChunk)
+                .join(DocumentChunk, DocumentChunk.id == EntityChunk.chunk_id)
+                .filter(DocumentChunk.document_id == document_id)
+                .distinct()
+                .all())
 
     def to_dict(self):
         return {
@@ -682,45 +1235,59 @@ class Entity(db.Model):
             'description': self.description,
             'properties': self.get_properties(),
             'mention_count': self.mention_count,
-            'created_at': self.created_at.isoformat()
+            'created_at': _iso(self.created_at)
         }
 
     def __repr__(self):
         return f'<Entity {self.name} ({self.entity_type})>'
 
 
-class Relation(db.Model):
+class Relation(BulkCreateMixin, SummaryMixin, db.Model):
     """Relationship between entities in knowledge graph"""
     __tablename__ = 'relations'
+    JSON_COLUMNS = ('properties',)
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'source': 'source_entity_id',
+        'target': 'target_entity_id',
+        'type': 'relation_type',
+        'confidence': 'confidence',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
-    source_entity_id = db.Column(db.Integer, db.ForeignKey('entities.id'), nullable=False)
-    target_entity_id = db.Column(db.Integer, db.ForeignKey('entities.id'), nullable=False)
+    source_entity_id = db.Column(db.Integer, db.ForeignKey('entities.id'), nullable=False, index=True)
+    target_entity_id = db.Column(db.Integer, db.ForeignKey('entities.id'), nullable=False, index=True)
     relation_type = db.Column(db.String(100), nullable=False)  # works_for, located_in, etc.
     properties = db.Column(db.Text)  # JSON-serialized additional properties
-    source_chunks = db.Column(db.Text)  # JSON list of chunk IDs where relation was found
     confidence = db.Column(db.Float, default=1.0)  # Confidence score
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Chunk IDs where the relation was found, in stored order (see Entity.chunk_links)
+    chunk_links = db.relationship('RelationChunk',
+                                  order_by=RelationChunk.position,
+                                  lazy=True,
+                                  cascade='all, delete-orphan')
+
     def set_properties(self, props):
         """Store properties as JSON"""
-        import json
-        self.properties = json.dumps(props)
+        self.properties = _json_dumps(props)
 
     def get_properties(self):
         """Retrieve properties as dict"""
-        import json
-        return json.loads(self.properties) if self.properties else {}
+        return _load_json_column(self, 'properties', {})
 
-    def set_source_chunks(self, chunks):
-        """Store source chunk IDs as JSON"""
-        import json
-        self.source_chunks = json.dumps(chunks)
+    def set_source_chunks(self, chunk_ids):
+        """Store source chunk IDs, keeping their order"""
+        self.chunk_links = _chunk_links(self.chunk_links, chunk_ids, RelationChunk)
 
     def get_source_chunks(self):
         """Retrieve source chunk IDs as list"""
-        import json
-        return json.loads(self.source_chunks) if self.source_chunks else []
+        return [link.chunk_id for link in self.chunk_links]
+
+    @classmethod
+    def citing_chunk(cls, chunk_id):
+        """Relations found in chunk_id"""
+        return cls.query.join(RelationChunk).filter(RelationChunk.chunk_id == chunk_id).all()
 
     def to_dict(self):
         return {
@@ -760,16 +1327,11 @@ class Skill(db.Model):
 
     def get_triggers(self):
         """Get list of trigger keywords"""
-        if not self.triggers:
-            return []
-        try:
-            return json.loads(self.triggers)
-        except:
-            return []
+        return _load_json_column(self, 'triggers', [])
 
     def set_triggers(self, triggers_list):
         """Set list of trigger keywords"""
-        self.triggers = json.dumps(triggers_list)
+        self.triggers = _json_dumps(triggers_list)
 
     def to_dict(self):
         """Convert skill to dictionary"""
@@ -780,15 +1342,15 @@ class Skill(db.Model):
             'description': self.description,
             'content': self.content,
             'agentId': self.agent_id,
-            'agentName': self.agent.name if self.agent else None,
+            'agentName': _loaded_name(Agent, self.agent_id),
             'isGlobal': self.is_global,
             'isActive': self.is_active,
             'category': self.category,
             'triggers': self.get_triggers(),
             'version': self.version,
             'author': self.author,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
+            'createdAt': _iso(self.created_at),
+            'updatedAt': _iso(self.updated_at)
         }
 
     def to_summary(self):
@@ -802,9 +1364,23 @@ class Skill(db.Model):
         return f'<Skill {self.name}>'
 
 
-class Integration(db.Model):
+# Integration config keys whose values are masked in to_dict
+_SECRET_KEY_RE = re.compile(r'key|token|secret|password', re.IGNORECASE)
+
+
+class Integration(SummaryMixin, db.Model):
     """Integration configuration for external services"""
     __tablename__ = 'integrations'
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'name': 'name',
+        'display_name': 'display_name',
+        'category': 'category',
+        'icon': 'icon',
+        'enabled': 'enabled',
+        'status': 'status',
+        'last_sync': 'last_sync',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)  # todoist, telegram, microsoft_graph, etc.
@@ -822,29 +1398,21 @@ class Integration(db.Model):
 
     def get_config(self):
         """Get configuration as dictionary"""
-        if not self.config:
-            return {}
-        try:
-            return json.loads(self.config)
-        except:
-            return {}
+        return _load_json_column(self, 'config', {})
 
     def set_config(self, config_dict):
         """Set configuration from dictionary"""
-        self.config = json.dumps(config_dict)
+        self.config = _json_dumps(config_dict)
 
     def to_dict(self, include_secrets=False):
         """Convert to dictionary"""
         config = self.get_config()
         # Mask sensitive fields unless explicitly requested
         if not include_secrets:
-            masked_config = {}
-            for key, value in config.items():
-                if any(secret in key.lower() for secret in ['key', 'token', 'secret', 'password']):
-                    masked_config[key] = '***' if value else ''
-                else:
-                    masked_config[key] = value
-            config = masked_config
+            config = {
+                key: ('***' if value else '') if _SECRET_KEY_RE.search(key) else value
+                for key, value in config.items()
+            }
 
         return {
             'id': self.id,
@@ -856,19 +1424,30 @@ class Integration(db.Model):
             'enabled': self.enabled,
             'config': config,
             'status': self.status,
-            'last_sync': self.last_sync.isoformat() if self.last_sync else None,
+            'last_sync': _iso(self.last_sync),
             'error_message': self.error_message,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at)
         }
 
     def __repr__(self):
         return f'<Integration {self.name} ({self.status})>'
 
 
-class Task(db.Model):
+class Task(SummaryMixin, db.Model):
     """Task management for spaces - from AscendoreQ integration"""
     __tablename__ = 'tasks'
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'space_id': 'space_id',
+        'space_name': 'space_name_cache',
+        'title': 'title',
+        'priority': 'priority',
+        'status': 'status',
+        'due_date': 'due_date',
+        'parent_task_id': 'parent_task_id',
+        'position': 'position',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
     space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
@@ -884,7 +1463,8 @@ class Task(db.Model):
     # Phase 2: Recurrence fields
     recurrence_type = db.Column(db.String(20))  # none, daily, weekly, monthly, custom
     recurrence_interval = db.Column(db.Integer, default=1)  # Every N days/weeks/months
-    recurrence_days = db.Column(db.Text)  # JSON array of days for weekly (0=Mon, 6=Sun)
+    recurrence_days = db.Column(db.Text)  # Legacy JSON array of days (read-only fallback)
+    recurrence_days_mask = db.Column(db.SmallInteger)  # Weekly days as a bitmask, bit 0=Mon ... bit 6=Sun
     recurrence_end_date = db.Column(db.DateTime)  # When recurrence stops
     next_occurrence = db.Column(db.DateTime)  # Next scheduled occurrence
     is_recurring_instance = db.Column(db.Boolean, default=False)  # True if created from recurrence
@@ -894,61 +1474,75 @@ class Task(db.Model):
     parent_task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'))  # Parent task for subtasks
     position = db.Column(db.Integer, default=0)  # Order position within parent
 
+    # Copy of space.name, kept in sync by the listeners below Notification
+    space_name_cache = db.Column(db.String(200))
+
+    __table_args__ = (
+        db.Index('ix_task_space_status_due', 'space_id', 'status', 'due_date'),
+        db.Index('ix_task_parent_pos', 'parent_task_id', 'position'),  # Subtasks in order
+    )
+
     # Relationships
     space = db.relationship('Space', backref=db.backref('tasks', lazy=True, cascade='all, delete-orphan'))
+    # Loaded per query (see query_with_subtasks): a selectin default is not
+    # applied to a self-referential relationship without join_depth
     subtasks = db.relationship('Task',
                                backref=db.backref('parent_task', remote_side=[id]),
                                foreign_keys=[parent_task_id],
                                lazy=True,
+                               order_by=position,
                                cascade='all, delete-orphan')
     recurring_instances = db.relationship('Task',
                                           backref=db.backref('original_task', remote_side=[id]),
                                           foreign_keys=[original_task_id],
                                           lazy=True)
 
+    @classmethod
+    def query_with_subtasks(cls):
+        """Query with two levels of subtasks eager-loaded (to_dict counts each task's subtasks)"""
+        return cls.query.options(selectinload(cls.subtasks).selectinload(cls.subtasks))
+
     def get_recurrence_days(self):
         """Get list of recurrence days"""
-        if not self.recurrence_days:
-            return []
-        try:
-            return json.loads(self.recurrence_days)
-        except:
-            return []
+        if self.recurrence_days_mask is not None:
+            return list(_WEEKDAYS_BY_MASK[self.recurrence_days_mask])
+        return _load_json_column(self, 'recurrence_days', [])
 
     def set_recurrence_days(self, days_list):
         """Set list of recurrence days"""
-        self.recurrence_days = json.dumps(days_list)
+        self.recurrence_days_mask = _weekday_mask(days_list)
+        self.recurrence_days = None
 
     def get_subtask_count(self):
         """Get count of subtasks"""
-        return len(self.subtasks) if self.subtasks else 0
+        return len(self.subtasks)
 
     def get_completed_subtask_count(self):
         """Get count of completed subtasks"""
-        if not self.subtasks:
-            return 0
-        return len([s for s in self.subtasks if s.status == 'completed'])
+        # Listings load subtasks with the parents (query_with_subtasks), so
+        # counting here costs no query; a SQL aggregate would add one
+        return sum(1 for s in self.subtasks if s.status == 'completed')
 
     def to_dict(self, include_subtasks=False):
         """Convert task to dictionary"""
         result = {
             'id': self.id,
             'space_id': self.space_id,
-            'space_name': self.space.name if self.space else None,
+            'space_name': _space_name(self),
             'title': self.title,
             'description': self.description,
             'priority': self.priority,
             'status': self.status,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'due_date': _iso(self.due_date),
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
+            'completed_at': _iso(self.completed_at),
             # Recurrence fields
             'recurrence_type': self.recurrence_type,
             'recurrence_interval': self.recurrence_interval,
             'recurrence_days': self.get_recurrence_days(),
-            'recurrence_end_date': self.recurrence_end_date.isoformat() if self.recurrence_end_date else None,
-            'next_occurrence': self.next_occurrence.isoformat() if self.next_occurrence else None,
+            'recurrence_end_date': _iso(self.recurrence_end_date),
+            'next_occurrence': _iso(self.next_occurrence),
             'is_recurring_instance': self.is_recurring_instance,
             'original_task_id': self.original_task_id,
             # Subtask fields
@@ -959,7 +1553,7 @@ class Task(db.Model):
         }
 
         if include_subtasks and self.subtasks:
-            result['subtasks'] = [s.to_dict(include_subtasks=False) for s in sorted(self.subtasks, key=lambda x: x.position)]
+            result['subtasks'] = [s.to_dict(include_subtasks=False) for s in self.subtasks]  # Ordered by position
 
         return result
 
@@ -971,9 +1565,23 @@ class Task(db.Model):
 # Phase 5: Notification Model
 # ===================================
 
-class Notification(db.Model):
+class Notification(SummaryMixin, db.Model):
     """User notifications for tasks, reminders, and system events"""
     __tablename__ = 'notifications'
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'user_id': 'user_id',
+        'task_id': 'task_id',
+        'space_id': 'space_id',
+        'title': 'title',
+        'type': 'notification_type',
+        'priority': 'priority',
+        'is_read': 'is_read',
+        'is_dismissed': 'is_dismissed',
+        'action_url': 'action_url',
+        'scheduled_for': 'scheduled_for',
+        'created_at': 'created_at',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Null for system-wide
@@ -1002,22 +1610,32 @@ class Notification(db.Model):
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # Relationships
-    task = db.relationship('Task', backref=db.backref('notifications', lazy=True, cascade='all, delete-orphan'))
+    # Copy of space.name, kept in sync by the listeners below
+    space_name_cache = db.Column(db.String(200))
+
+    # Unread/undismissed notifications per user
+    __table_args__ = (
+        db.Index('ix_notif_user_unread', 'user_id', 'is_read', 'is_dismissed', 'scheduled_for'),
+    )
+
+    # Relationships (task is joined: to_dict always embeds it. The space name
+    # comes from space_name_cache, so space itself is loaded on demand)
+    task = db.relationship('Task', lazy='joined', backref=db.backref('notifications', lazy=True, cascade='all, delete-orphan'))
     space = db.relationship('Space', backref=db.backref('notifications', lazy=True, cascade='all, delete-orphan'))
 
+    @classmethod
+    def query_with_related(cls):
+        """Query with task and its subtasks eager-loaded (to_dict embeds the task)"""
+        # Task.subtasks is lazy by default; chain it so to_dict's counts are loaded
+        return cls.query.options(joinedload(cls.task).selectinload(Task.subtasks))
+
     def get_action_data(self):
         """Get action data as dictionary"""
-        if not self.action_data:
-            return {}
-        try:
-            return json.loads(self.action_data)
-        except:
-            return {}
+        return _load_json_column(self, 'action_data', {})
 
     def set_action_data(self, data):
         """Set action data from dictionary"""
-        self.action_data = json.dumps(data)
+        self.action_data = _json_dumps(data)
 
     def mark_read(self):
         """Mark notification as read"""
@@ -1030,6 +1648,7 @@ class Notification(db.Model):
         self.dismissed_at = datetime.utcnow()
 
     def to_dict(self):
+        task = self.task
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -1040,28 +1659,92 @@ class Notification(db.Model):
             'type': self.notification_type,
             'priority': self.priority,
             'is_read': self.is_read,
-            'read_at': self.read_at.isoformat() if self.read_at else None,
+            'read_at': _iso(self.read_at),
             'is_dismissed': self.is_dismissed,
             'action_url': self.action_url,
             'action_data': self.get_action_data(),
-            'scheduled_for': self.scheduled_for.isoformat() if self.scheduled_for else None,
-            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'task': self.task.to_dict() if self.task else None,
-            'space_name': self.space.name if self.space else None,
+            'scheduled_for': _iso(self.scheduled_for),
+            'sent_at': _iso(self.sent_at),
+            'created_at': _iso(self.created_at),
+            'task': task.to_dict() if task else None,
+            'space_name': _space_name(self),
         }
 
     def __repr__(self):
         return f'<Notification {self.title} ({self.notification_type})>'
 
 
+# ===================================
+# Denormalized space names
+# ===================================
+# Task and Notification listings show the space name on every row. It is
+# copied into space_name_cache when the row is written and fanned out when
+# a space is renamed, so to_dict doesn't load the space per row.
+
+def _space_name(row):
+    """Space name for a Task/Notification, falling back to the relationship"""
+    if row.space_name_cache is not None:
+        return row.space_name_cache
+    return _loaded_name(Space, row.space_id)
+
+
+def _fill_space_name_cache(mapper, connection, target):
+    """Set space_name_cache from the row's space"""
+    space = target.__dict__.get('space')
+    if space is not None and space.id == target.space_id:
+        target.space_name_cache = space.name
+    elif target.space_id is None:
+        target.space_name_cache = None
+    else:
+        target.space_name_cache = connection.scalar(
+            select(Space.name).where(Space.id == target.space_id)
+        )
+
+
+def _refill_space_name_cache(mapper, connection, target):
+    """Refresh space_name_cache when a row moves to another space"""
+    if inspect(target).attrs.space_id.history.has_changes():
+        _fill_space_name_cache(mapper, connection, target)
+
+
+for _model in (Task, Notification):
+    event.listen(_model, 'before_insert', _fill_space_name_cache)
+    event.listen(_model, 'before_update', _refill_space_name_cache)
+
+
+@event.listens_for(Space, 'after_update')
+def _fan_out_space_rename(mapper, connection, target):
+    """Copy a renamed space's name to its tasks and notifications"""
+    if not inspect(target).attrs.name.history.has_changes():
+        return
+    for model in (Task, Notification):
+        connection.execute(
+            update(model.__table__)
+            .where(model.__table__.c.space_id == target.id)
+            .values(space_name_cache=target.name)
+        )
+
+
 # ===================================
 # Phase 6: Task Template Model
 # ===================================
 
-class TaskTemplate(db.Model):
+class TaskTemplate(SummaryMixin, db.Model):
     """Reusable task templates for quick task creation"""
     __tablename__ = 'task_templates'
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'name': 'name',
+        'category': 'category',
+        'icon': 'icon',
+        'color': 'color',
+        'default_priority': 'default_priority',
+        'space_id': 'space_id',
+        'is_global': 'is_global',
+        'is_active': 'is_active',
+        'use_count': 'use_count',
+        'last_used_at': 'last_used_at',
+    }
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -1076,7 +1759,8 @@ class TaskTemplate(db.Model):
     # Recurrence defaults
     default_recurrence_type = db.Column(db.String(20))
     default_recurrence_interval = db.Column(db.Integer, default=1)
-    default_recurrence_days = db.Column(db.Text)  # JSON array
+    default_recurrence_days = db.Column(db.Text)  # Legacy JSON array (read-only fallback)
+    default_recurrence_days_mask = db.Column(db.SmallInteger)  # Weekday bitmask, as Task.recurrence_days_mask
 
     # Subtask templates
     subtask_templates = db.Column(db.Text)  # JSON array of subtask templates
@@ -1105,47 +1789,42 @@ class TaskTemplate(db.Model):
 
     def get_subtask_templates(self):
         """Get subtask templates as list"""
-        if not self.subtask_templates:
-            return []
-        try:
-            return json.loads(self.subtask_templates)
-        except:
-            return []
+        return _load_json_column(self, 'subtask_templates', [])
 
     def set_subtask_templates(self, templates):
         """Set subtask templates from list"""
-        self.subtask_templates = json.dumps(templates)
+        self.subtask_templates = _json_dumps(templates)
 
     def get_tags(self):
         """Get tags as list"""
-        if not self.tags:
-            return []
-        try:
-            return json.loads(self.tags)
-        except:
-            return []
+        return _load_json_column(self, 'tags', [])
 
     def set_tags(self, tags_list):
         """Set tags from list"""
-        self.tags = json.dumps(tags_list)
+        self.tags = _json_dumps(tags_list)
 
     def get_recurrence_days(self):
         """Get recurrence days as list"""
-        if not self.default_recurrence_days:
-            return []
-        try:
-            return json.loads(self.default_recurrence_days)
-        except:
-            return []
+        if self.default_recurrence_days_mask is not None:
+            return list(_WEEKDAYS_BY_MASK[self.default_recurrence_days_mask])
+        return _load_json_column(self, 'default_recurrence_days', [])
 
     def set_recurrence_days(self, days_list):
         """Set recurrence days from list"""
-        self.default_recurrence_days = json.dumps(days_list)
+        self.default_recurrence_days_mask = _weekday_mask(days_list)
+        self.default_recurrence_days = None
 
     def increment_usage(self):
-        """Track template usage"""
-        self.use_count = (self.use_count or 0) + 1
-        self.last_used_at = datetime.utcnow()
+        """Track template usage with one atomic UPDATE (no read-modify-write)"""
+        db.session.execute(
+            update(TaskTemplate)
+            .where(TaskTemplate.id == self.id)
+            .values(use_count=func.coalesce(TaskTemplate.use_count, 0) + 1,
+                    last_used_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        # Reload the new values on next access
+        db.session.expire(self, ['use_count', 'last_used_at'])
 
     def to_dict(self):
         return {
@@ -1168,9 +1847,9 @@ class TaskTemplate(db.Model):
             'is_global': self.is_global,
             'is_active': self.is_active,
             'use_count': self.use_count,
-            'last_used_at': self.last_used_at.isoformat() if self.last_used_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'last_used_at': _iso(self.last_used_at),
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
         }
 
     def __repr__(self):
@@ -1181,9 +1860,23 @@ class TaskTemplate(db.Model):
 # Phase 4: Calendar Event Model
 # ===================================
 
-class CalendarEvent(db.Model):
+class CalendarEvent(SummaryMixin, db.Model):
     """Calendar events linked to tasks or standalone"""
     __tablename__ = 'calendar_events'
+    SUMMARY_FIELDS = {
+        'id': 'id',
+        'task_id': 'task_id',
+        'space_id': 'space_id',
+        'title': 'title',
+        'start_time': 'start_time',
+        'end_time': 'end_time',
+        'all_day': 'all_day',
+        'color': 'color',
+        'event_type': 'event_type',
+        'status': 'status',
+    }
+    EVENT_TYPES = ('event', 'meeting', 'deadline', 'reminder', 'block')
+    STATUSES = ('confirmed', 'tentative', 'cancelled')
 
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=True)
@@ -1219,45 +1912,58 @@ class CalendarEvent(db.Model):
     last_synced_at = db.Column(db.DateTime)
 
     # Reminders
-    reminder_minutes = db.Column(db.Text)  # JSON array of minutes before event [5, 15, 60]
+    reminder_minutes = db.Column(JSON_DOC_TYPE)  # Minutes before event [5, 15, 60]
 
     # Attendees (for meetings)
-    attendees = db.Column(db.Text)  # JSON array of attendee info
+    attendees = db.Column(JSON_DOC_TYPE)  # List of attendee info
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Calendar views filter by time range, optionally within a space;
+    # external lookups match events back to their synced source
+    __table_args__ = (
+        db.Index('ix_cal_space_start', 'space_id', 'start_time'),
+        db.Index('ix_cal_start', 'start_time'),
+        db.Index('ix_cal_task', 'task_id'),
+        db.Index('ix_cal_external', 'external_source', 'external_id'),
+        # Also enforced for rows written outside CalendarService (e.g. syncs)
+        db.CheckConstraint('end_time >= start_time', name='ck_cal_time_order'),
+        db.CheckConstraint(f"event_type IN {EVENT_TYPES}", name='ck_cal_event_type'),
+        db.CheckConstraint(f"status IN {STATUSES}", name='ck_cal_status'),
+    )
+
     # Relationships
     task = db.relationship('Task', backref=db.backref('calendar_events', lazy=True, cascade='all, delete-orphan'))
     space = db.relationship('Space', backref=db.backref('calendar_events', lazy=True))
 
+    @classmethod
+    def query_with_related(cls):
+        """Query with task and space eager-loaded (to_dict reads both)"""
+        # Task.subtasks is lazy by default; chain it so to_dict's counts are loaded
+        return cls.query.options(
+            selectinload(cls.task).selectinload(Task.subtasks),
+            joinedload(cls.space),
+        )
+
     def get_reminder_minutes(self):
         """Get reminder minutes as list"""
-        if not self.reminder_minutes:
-            return [15]  # Default 15 minutes
-        try:
-            return json.loads(self.reminder_minutes)
-        except:
-            return [15]
+        return _get_json_doc(self, 'reminder_minutes', [15])  # Default 15 minutes
 
     def set_reminder_minutes(self, minutes_list):
         """Set reminder minutes from list"""
-        self.reminder_minutes = json.dumps(minutes_list)
+        self.reminder_minutes = minutes_list
 
     def get_attendees(self):
         """Get attendees as list"""
-        if not self.attendees:
-            return []
-        try:
-            return json.loads(self.attendees)
-        except:
-            return []
+        return _get_json_doc(self, 'attendees', [])
 
     def set_attendees(self, attendees_list):
         """Set attendees from list"""
-        self.attendees = json.dumps(attendees_list)
+        self.attendees = attendees_list
 
     def to_dict(self):
+        task, space = self.task, self.space
         return {
             'id': self.id,
             'task_id': self.task_id,
@@ -1265,13 +1971,13 @@ class CalendarEvent(db.Model):
             'title': self.title,
             'description': self.description,
             'location': self.location,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'start_time': _iso(self.start_time),
+            'end_time': _iso(self.end_time),
             'all_day': self.all_day,
             'timezone': self.timezone,
             'is_recurring': self.is_recurring,
             'recurrence_rule': self.recurrence_rule,
-            'recurrence_end': self.recurrence_end.isoformat() if self.recurrence_end else None,
+            'recurrence_end': _iso(self.recurrence_end),
             'event_type': self.event_type,
             'status': self.status,
             'color': self.color,
@@ -1280,72 +1986,71 @@ class CalendarEvent(db.Model):
             'sync_status': self.sync_status,
             'reminder_minutes': self.get_reminder_minutes(),
             'attendees': self.get_attendees(),
-            'task': self.task.to_dict() if self.task else None,
-            'space_name': self.space.name if self.space else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'task': task.to_dict() if task else None,
+            'space_name': space.name if space else None,
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
         }
 
     def __repr__(self):
-        return f'<CalendarEvent {self.title} ({self.start_time})>'
+        return f'<CalendarEvent {self.title[:40]}>'
+
+
+# Built once at import; seeded with a single multi-row INSERT
+SEED_INTEGRATIONS = (
+    {
+        'name': 'todoist',
+        'display_name': 'Todoist',
+        'description': 'Sync tasks, create projects, and manage your to-do lists with Todoist integration.',
+        'category': 'productivity',
+        'icon': 'todoist'
+    },
+    {
+        'name': 'telegram',
+        'display_name': 'Telegram Bot',
+        'description': 'Access Cleo on the go via Telegram. Chat with your agents from anywhere.',
+        'category': 'communication',
+        'icon': 'telegram'
+    },
+    {
+        'name': 'microsoft_graph',
+        'display_name': 'Microsoft 365',
+        'description': 'Connect to Outlook calendar, email, and Microsoft 365 services.',
+        'category': 'calendar',
+        'icon': 'microsoft'
+    },
+    {
+        'name': 'google_calendar',
+        'display_name': 'Google Calendar',
+        'description': 'Sync your Google Calendar events and manage schedules.',
+        'category': 'calendar',
+        'icon': 'google'
+    },
+    {
+        'name': 'slack',
+        'display_name': 'Slack',
+        'description': 'Receive notifications and interact with Cleo through Slack.',
+        'category': 'communication',
+        'icon': 'slack'
+    },
+    {
+        'name': 'notion',
+        'display_name': 'Notion',
+        'description': 'Connect your Notion workspace for document and knowledge management.',
+        'category': 'productivity',
+        'icon': 'notion'
+    }
+)
 
 
 def seed_integrations():
     """Seed default integrations"""
-    if Integration.query.count() > 0:
+    if db.session.query(Integration.id).first() is not None:
         return
 
-    default_integrations = [
-        {
-            'name': 'todoist',
-            'display_name': 'Todoist',
-            'description': 'Sync tasks, create projects, and manage your to-do lists with Todoist integration.',
-            'category': 'productivity',
-            'icon': 'todoist'
-        },
-        {
-            'name': 'telegram',
-            'display_name': 'Telegram Bot',
-            'description': 'Access Cleo on the go via Telegram. Chat with your agents from anywhere.',
-            'category': 'communication',
-            'icon': 'telegram'
-        },
-        {
-            'name': 'microsoft_graph',
-            'display_name': 'Microsoft 365',
-            'description': 'Connect to Outlook calendar, email, and Microsoft 365 services.',
-            'category': 'calendar',
-            'icon': 'microsoft'
-        },
-        {
-            'name': 'google_calendar',
-            'display_name': 'Google Calendar',
-            'description': 'Sync your Google Calendar events and manage schedules.',
-            'category': 'calendar',
-            'icon': 'google'
-        },
-        {
-            'name': 'slack',
-            'display_name': 'Slack',
-            'description': 'Receive notifications and interact with Cleo through Slack.',
-            'category': 'communication',
-            'icon': 'slack'
-        },
-        {
-            'name': 'notion',
-            'display_name': 'Notion',
-            'description': 'Connect your Notion workspace for document and knowledge management.',
-            'category': 'productivity',
-            'icon': 'notion'
-        }
-    ]
-
-    for integration_data in default_integrations:
-        integration = Integration(**integration_data)
-        db.session.add(integration)
-
+    db.session.execute(insert(Integration), SEED_INTEGRATIONS)
     db.session.commit()
-    print(f"[SUCCESS] Seeded {len(default_integrations)} integrations")
+    print(f"[SUCCESS] Seeded {len(SEED_INTEGRATIONS)} integrations")
 
 
 def init_db(app=None):
@@ -1365,6 +2070,11 @@ def init_db(app=None):
         app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
         app.config['SECRET_KEY'] = SECRET_KEY
+        if 'postgresql' in DATABASE_URI:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+                'pool_pre_ping': True,
+                'pool_recycle': 300,
+            }
 
         db.init_app(app)
         with app.app_context():
@@ -1373,60 +2083,59 @@ def init_db(app=None):
             seed_agents()
 
 
+# Built once at import; seeded with a single multi-row INSERT
+SEED_AGENTS = (
+    # Master
+    {'name': 'Cleo', 'type': 'master', 'description': 'Master orchestrator'},
+
+    # Personal
+    {'name': 'Coach', 'type': 'personal', 'description': 'Personal development coach'},
+    {'name': 'HealthFit', 'type': 'personal', 'description': 'Health and fitness advisor'},
+
+    # Team
+    {'name': 'DecideWrightMD', 'type': 'team', 'description': 'Decision support MD'},
+    {'name': 'S55MD', 'type': 'team', 'description': 'Studio55 MD'},
+    {'name': 'SparkwireMediaMD', 'type': 'team', 'description': 'Media MD'},
+    {'name': 'ThinTanksMD', 'type': 'team', 'description': 'Research MD'},
+    {'name': 'AscendoreMD', 'type': 'team', 'description': 'Business MD'},
+    {'name': 'BoxzeroMD', 'type': 'team', 'description': 'Strategic MD'},
+
+    # Worker
+    {'name': 'EA', 'type': 'worker', 'description': 'Executive Assistant'},
+    {'name': 'Legal', 'type': 'worker', 'description': 'Legal Expert'},
+    {'name': 'CMO', 'type': 'worker', 'description': 'Chief Marketing Officer'},
+    {'name': 'CC', 'type': 'worker', 'description': 'Content Creator'},
+    {'name': 'CCO', 'type': 'worker', 'description': 'Chief Consultancy Officer'},
+    {'name': 'CPO', 'type': 'worker', 'description': 'Chief Product Officer'},
+    {'name': 'FD', 'type': 'worker', 'description': 'Finance Director'},
+    {'name': 'CSO', 'type': 'worker', 'description': 'Chief Sales Officer'},
+    {'name': 'SysAdmin', 'type': 'worker', 'description': 'System Administrator'},
+
+    # Expert
+    {'name': 'RegTech', 'type': 'expert', 'description': 'Regulatory Technology Expert'},
+    {'name': 'DataScience', 'type': 'expert', 'description': 'Data Science Expert'},
+    {'name': 'CyberSecurity', 'type': 'expert', 'description': 'Cybersecurity Expert'},
+    {'name': 'ESG', 'type': 'expert', 'description': 'ESG Expert'},
+    {'name': 'AIEthics', 'type': 'expert', 'description': 'AI Ethics Expert'},
+    {'name': 'FinancialModeling', 'type': 'expert', 'description': 'Financial Modeling Expert'},
+    {'name': 'MarketingStrategist', 'type': 'expert', 'description': 'Marketing Strategy Expert'},
+    {'name': 'Copywriter', 'type': 'expert', 'description': 'Copywriting Expert'},
+    {'name': 'Designer', 'type': 'expert', 'description': 'Design Expert'},
+    {'name': 'TechnicalWriter', 'type': 'expert', 'description': 'Technical Writing Expert'},
+    {'name': 'StrategyRisk', 'type': 'expert', 'description': 'Strategy & Risk Expert'},
+)
+
+
 def seed_agents():
     """Seed database with initial agent records"""
     # Check if agents already exist
-    if Agent.query.count() > 0:
+    if db.session.query(Agent.id).first() is not None:
         print("[INFO]  Agents already seeded")
         return
 
-    agents = [
-        # Master
-        {'name': 'Cleo', 'type': 'master', 'description': 'Master orchestrator'},
-
-        # Personal
-        {'name': 'Coach', 'type': 'personal', 'description': 'Personal development coach'},
-        {'name': 'HealthFit', 'type': 'personal', 'description': 'Health and fitness advisor'},
-
-        # Team
-        {'name': 'DecideWrightMD', 'type': 'team', 'description': 'Decision support MD'},
-        {'name': 'S55MD', 'type': 'team', 'description': 'Studio55 MD'},
-        {'name': 'SparkwireMediaMD', 'type': 'team', 'description': 'Media MD'},
-        {'name': 'ThinTanksMD', 'type': 'team', 'description': 'Research MD'},
-        {'name': 'AscendoreMD', 'type': 'team', 'description': 'Business MD'},
-        {'name': 'BoxzeroMD', 'type': 'team', 'description': 'Strategic MD'},
-
-        # Worker
-        {'name': 'EA', 'type': 'worker', 'description': 'Executive Assistant'},
-        {'name': 'Legal', 'type': 'worker', 'description': 'Legal Expert'},
-        {'name': 'CMO', 'type': 'worker', 'description': 'Chief Marketing Officer'},
-        {'name': 'CC', 'type': 'worker', 'description': 'Content Creator'},
-        {'name': 'CCO', 'type': 'worker', 'description': 'Chief Consultancy Officer'},
-        {'name': 'CPO', 'type': 'worker', 'description': 'Chief Product Officer'},
-        {'name': 'FD', 'type': 'worker', 'description': 'Finance Director'},
-        {'name': 'CSO', 'type': 'worker', 'description': 'Chief Sales Officer'},
-        {'name': 'SysAdmin', 'type': 'worker', 'description': 'System Administrator'},
-
-        # Expert
-        {'name': 'RegTech', 'type': 'expert', 'description': 'Regulatory Technology Expert'},
-        {'name': 'DataScience', 'type': 'expert', 'description': 'Data Science Expert'},
-        {'name': 'CyberSecurity', 'type': 'expert', 'description': 'Cybersecurity Expert'},
-        {'name': 'ESG', 'type': 'expert', 'description': 'ESG Expert'},
-        {'name': 'AIEthics', 'type': 'expert', 'description': 'AI Ethics Expert'},
-        {'name': 'FinancialModeling', 'type': 'expert', 'description': 'Financial Modeling Expert'},
-        {'name': 'MarketingStrategist', 'type': 'expert', 'description': 'Marketing Strategy Expert'},
-        {'name': 'Copywriter', 'type': 'expert', 'description': 'Copywriting Expert'},
-        {'name': 'Designer', 'type': 'expert', 'description': 'Design Expert'},
-        {'name': 'TechnicalWriter', 'type': 'expert', 'description': 'Technical Writing Expert'},
-        {'name': 'StrategyRisk', 'type': 'expert', 'description': 'Strategy & Risk Expert'},
-    ]
-
-    for agent_data in agents:
-        agent = Agent(**agent_data)
-        db.session.add(agent)
-
+    db.session.execute(insert(Agent), SEED_AGENTS)
     db.session.commit()
-    print(f"[SUCCESS] Seeded {len(agents)} agents")
+    print(f"[SUCCESS] Seeded {len(SEED_AGENTS)} agents")
 
 
 if __name__ == "__main__":
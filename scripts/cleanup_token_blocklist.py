@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Purge expired entries from the JWT token blocklist
+
+Revoked tokens only need to stay blocklisted until they expire. Run daily
+(e.g. from cron) so revocation lookups stay fast as the table would
+otherwise grow with every logout.
+
+Usage:
+    python scripts/cleanup_token_blocklist.py
+
+Cron example (03:15 daily):
+    15 3 * * * cd /app && python scripts/cleanup_token_blocklist.py
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from services.auth.jwt_service import JWTService
+
+
+def main():
+    with app.app_context():
+        removed = JWTService.cleanup_expired_tokens()
+        print(f"Removed {removed} expired blocklist entries")
+
+
+if __name__ == "__main__":
+    main()
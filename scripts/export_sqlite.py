@@ -10,14 +10,29 @@ import os
 import sys
 import json
 import argparse
+import base64
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Fast JSON encoding (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from flask import Flask
-from models import db, User, Agent, Job, Activity, Space, Message, Document, DocumentChunk, Entity, Relation, Integration, Skill, Task, Notification, CalendarEvent, TaskTemplate
+from sqlalchemy import select
+from models import db, User, Agent, Job, Activity, Space, Message, Document, DocumentChunk, Entity, Relation, EntityChunk, RelationChunk, Integration, Skill, Task, Notification, CalendarEvent, TaskTemplate, SpaceAgent
+
+
+# Rows fetched per round-trip while exporting, so large tables (chunks,
+# messages, calendar events) are never held in memory all at once
+EXPORT_BATCH_SIZE = 500
 
 
 def create_app():
@@ -36,36 +51,64 @@ def serialize_datetime(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
-def export_table(model, name, output_dir):
-    """Export a single table to JSON"""
-    records = model.query.all()
-    data = []
-
-    for record in records:
-        if hasattr(record, 'to_dict'):
-            row = record.to_dict()
-        else:
-            # Fallback: export all columns
-            row = {}
-            for column in model.__table__.columns:
-                value = getattr(record, column.name)
-                if isinstance(value, datetime):
-                    value = value.isoformat()
-                row[column.name] = value
-        data.append(row)
+def dump_row(row):
+    """Encode one row as indented JSON (orjson handles datetimes natively)"""
+    if orjson:
+        return orjson.dumps(row, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(row, indent=2, default=serialize_datetime)
+
 
+def export_table(model, name, output_dir):
+    """
+    Export a single table to JSON
+
+    Rows are read with a Core SELECT of the table's columns (no ORM objects,
+    no to_dict), so each record is keyed by column name exactly as
+    import_postgres.py expects. Binary columns are base64-encoded.
+
+    Rows are streamed in EXPORT_BATCH_SIZE batches and written one at a
+    time as an indented JSON array.
+    """
+    table = model.__table__
+    binary_columns = [c.name for c in table.columns if isinstance(c.type, db.LargeBinary)]
     output_path = output_dir / f"{name}.json"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, default=serialize_datetime)
+    count = 0
 
-    print(f"  Exported {len(data)} {name} records")
-    return len(data)
+    result = db.session.execute(
+        select(table).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for partition in result.mappings().partitions():
+            for mapping in partition:
+                row = dict(mapping)
+                for column in binary_columns:
+                    if row[column] is not None:
+                        row[column] = base64.b64encode(row[column]).decode('ascii')
+                f.write(',\n' if count else '\n')
+                f.write(textwrap.indent(dump_row(row), '  '))
+                count += 1
+        f.write('\n]' if count else ']')
+
+    print(f"  Exported {count} {name} records")
+    return count
+
+
+def export_table_in_context(app, model, name, output_dir):
+    """Export a table from a worker thread, with its own app context and session"""
+    with app.app_context():
+        try:
+            return export_table(model, name, output_dir)
+        finally:
+            db.session.remove()
 
 
 def main():
     parser = argparse.ArgumentParser(description='Export SQLite database to JSON')
     parser.add_argument('--output', '-o', default='data/export',
                         help='Output directory for JSON files')
+    parser.add_argument('--workers', '-w', type=int, default=8,
+                        help='Tables exported in parallel (1 for serial)')
     args = parser.parse_args()
 
     output_dir = Path(args.output)
@@ -84,11 +127,14 @@ def main():
             (Job, 'jobs'),
             (Activity, 'activities'),
             (Space, 'spaces'),
+            (SpaceAgent, 'space_agents'),
             (Message, 'messages'),
             (Document, 'documents'),
             (DocumentChunk, 'document_chunks'),
             (Entity, 'entities'),
             (Relation, 'relations'),
+            (EntityChunk, 'entity_chunks'),
+            (RelationChunk, 'relation_chunks'),
             (Integration, 'integrations'),
             (Skill, 'skills'),
             (Task, 'tasks'),
@@ -97,13 +143,20 @@ def main():
             (TaskTemplate, 'task_templates'),
         ]
 
+        # Tables are independent files; SQLite serves concurrent readers,
+        # so large tables (chunks, messages) export side by side
         total = 0
-        for model, name in tables:
-            try:
-                count = export_table(model, name, output_dir)
-                total += count
-            except Exception as e:
-                print(f"  Error exporting {name}: {e}")
+        workers = max(1, min(args.workers, len(tables)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (name, executor.submit(export_table_in_context, app, model, name, output_dir))
+                for model, name in tables
+            ]
+            for name, future in futures:
+                try:
+                    total += future.result()
+                except Exception as e:
+                    print(f"  Error exporting {name}: {e}")
 
         print()
         print(f"Total records exported: {total}")
@@ -9,10 +9,17 @@ Usage:
 import os
 import sys
 import json
+import base64
 import argparse
 from datetime import datetime
 from pathlib import Path
 
+# Fast JSON decoding (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -20,7 +27,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from flask import Flask
-from models import db, User, Agent, Job, Activity, Space, Message, Document, DocumentChunk, Entity, Relation, Integration, Skill, Task, Notification, CalendarEvent, TaskTemplate
+from sqlalchemy.dialects.postgresql import JSONB
+from models import db, User, Agent, Job, Activity, Space, Message, Document, DocumentChunk, Entity, Relation, EntityChunk, RelationChunk, Integration, Skill, Task, Notification, CalendarEvent, TaskTemplate, SpaceAgent
 
 
 def create_app():
@@ -38,6 +46,12 @@ def create_app():
     app = Flask(__name__)
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Long imports sit idle between tables; drop connections the server
+    # (or Azure's gateway) may have closed, as app.py does
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+    }
     db.init_app(app)
     return app
 
@@ -62,8 +76,11 @@ def import_table(model, name, input_dir, clear_existing=False):
         print(f"  Skipping {name} (file not found)")
         return 0
 
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if orjson:
+        data = orjson.loads(input_path.read_bytes())
+    else:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
     if not data:
         print(f"  Skipping {name} (no data)")
@@ -80,6 +97,12 @@ def import_table(model, name, input_dir, clear_existing=False):
             for column in model.__table__.columns:
                 if column.name in row and isinstance(column.type, db.DateTime):
                     row[column.name] = parse_datetime(row.get(column.name))
+                # SQLite stores these as JSON text; JSONB columns take the decoded value
+                elif column.name in row and isinstance(column.type, JSONB) and isinstance(row[column.name], str):
+                    row[column.name] = json.loads(row[column.name])
+                # Binary columns are exported base64-encoded
+                elif column.name in row and isinstance(column.type, db.LargeBinary) and isinstance(row[column.name], str):
+                    row[column.name] = base64.b64decode(row[column.name])
 
             # Remove fields that are computed or not in the model
             valid_columns = {c.name for c in model.__table__.columns}
@@ -134,6 +157,7 @@ def main():
             (User, 'users'),
             (Agent, 'agents'),
             (Space, 'spaces'),
+            (SpaceAgent, 'space_agents'),
             (Job, 'jobs'),
             (Activity, 'activities'),
             (Message, 'messages'),
@@ -141,6 +165,8 @@ def main():
             (DocumentChunk, 'document_chunks'),
             (Entity, 'entities'),
             (Relation, 'relations'),
+            (EntityChunk, 'entity_chunks'),
+            (RelationChunk, 'relation_chunks'),
             (Integration, 'integrations'),
             (Skill, 'skills'),
             (Task, 'tasks'),
@@ -166,6 +192,8 @@ def main():
         print()
         print("Resetting PostgreSQL sequences...")
         for model, name in tables:
+            if 'id' not in model.__table__.c:
+                continue  # Composite-key tables (space_agents) have no sequence
             try:
                 db.session.execute(db.text(f"""
                     SELECT setval(pg_get_serial_sequence('{name}', 'id'),
@@ -106,7 +106,7 @@ def main():
                     for chunk in chunks:
                         try:
                             embedding = vector_store.model.encode(chunk.content, convert_to_numpy=True)
-                            chunk.set_embedding(embedding.tolist())
+                            chunk.set_embedding(embedding)
                             processed += 1
                         except Exception as e:
                             print(f"  Error processing chunk {chunk.id}: {e}")
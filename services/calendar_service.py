@@ -6,7 +6,6 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy import func, and_, or_
 from models import db, CalendarEvent, Task, Space
-import json
 
 
 class CalendarService:
@@ -68,9 +67,8 @@ class CalendarService:
                 raise ValueError(f"Task with id {task_id} not found")
 
         # Validate event type
-        valid_types = ['event', 'meeting', 'deadline', 'reminder', 'block']
-        if event_type not in valid_types:
-            raise ValueError(f"Invalid event type. Must be one of: {valid_types}")
+        if event_type not in CalendarEvent.EVENT_TYPES:
+            raise ValueError(f"Invalid event type. Must be one of: {list(CalendarEvent.EVENT_TYPES)}")
 
         # Validate times
         if end_time < start_time:
@@ -117,7 +115,8 @@ class CalendarService:
         end_date: Optional[datetime] = None,
         event_type: Optional[str] = None,
         include_cancelled: bool = False,
-        limit: int = 100
+        limit: int = 100,
+        summary_only: bool = False
     ) -> List[CalendarEvent]:
         """
         List events with optional filters.
@@ -130,11 +129,15 @@ class CalendarService:
             event_type: Filter by event type
             include_cancelled: Include cancelled events
             limit: Maximum events to return
+            summary_only: Load only the columns used by CalendarEvent.to_summary
 
         Returns:
             List of CalendarEvent objects
         """
-        query = CalendarEvent.query
+        if summary_only:
+            query = CalendarEvent.query.options(*CalendarEvent.summary_options())
+        else:
+            query = CalendarEvent.query_with_related()
 
         if space_id is not None:
             query = query.filter(CalendarEvent.space_id == space_id)
@@ -162,7 +165,8 @@ class CalendarService:
     def get_events_for_range(
         start_date: datetime,
         end_date: datetime,
-        space_id: Optional[int] = None
+        space_id: Optional[int] = None,
+        summary_only: bool = False
     ) -> List[CalendarEvent]:
         """
         Get all events that overlap with a date range.
@@ -172,11 +176,17 @@ class CalendarService:
             start_date: Range start
             end_date: Range end
             space_id: Optional space filter
+            summary_only: Load only the columns used by CalendarEvent.to_summary
 
         Returns:
             List of overlapping events
         """
-        query = CalendarEvent.query.filter(
+        if summary_only:
+            query = CalendarEvent.query.options(*CalendarEvent.summary_options())
+        else:
+            query = CalendarEvent.query_with_related()
+
+        query = query.filter(
             and_(
                 CalendarEvent.status != 'cancelled',
                 or_(
@@ -222,15 +232,19 @@ class CalendarService:
 
         # Validate event type if being updated
         if 'event_type' in updates:
-            valid_types = ['event', 'meeting', 'deadline', 'reminder', 'block']
-            if updates['event_type'] not in valid_types:
-                raise ValueError(f"Invalid event type. Must be one of: {valid_types}")
+            if updates['event_type'] not in CalendarEvent.EVENT_TYPES:
+                raise ValueError(f"Invalid event type. Must be one of: {list(CalendarEvent.EVENT_TYPES)}")
 
         # Validate status if being updated
         if 'status' in updates:
-            valid_statuses = ['confirmed', 'tentative', 'cancelled']
-            if updates['status'] not in valid_statuses:
-                raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
+            if updates['status'] not in CalendarEvent.STATUSES:
+                raise ValueError(f"Invalid status. Must be one of: {list(CalendarEvent.STATUSES)}")
+
+        # Validate time order against the resulting times (ck_cal_time_order)
+        start_time = updates.get('start_time', event.start_time)
+        end_time = updates.get('end_time', event.end_time)
+        if start_time and end_time and end_time < start_time:
+            raise ValueError("End time must be after start time")
 
         # Apply updates
         allowed_fields = [
@@ -6,7 +6,6 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy import func, and_, or_
 from models import db, Notification, Task, Space
-import json
 
 
 class NotificationService:
@@ -85,7 +84,8 @@ class NotificationService:
         notification_type: Optional[str] = None,
         unread_only: bool = False,
         include_dismissed: bool = False,
-        limit: int = 50
+        limit: int = 50,
+        summary_only: bool = False
     ) -> List[Notification]:
         """
         List notifications with optional filters.
@@ -97,11 +97,15 @@ class NotificationService:
             unread_only: Only return unread notifications
             include_dismissed: Include dismissed notifications
             limit: Maximum notifications to return
+            summary_only: Load only the columns used by Notification.to_summary
 
         Returns:
             List of Notification objects
         """
-        query = Notification.query
+        if summary_only:
+            query = Notification.query.options(*Notification.summary_options())
+        else:
+            query = Notification.query_with_related()
 
         if user_id is not None:
             query = query.filter(
@@ -162,12 +166,14 @@ class NotificationService:
                 or_(Notification.user_id == user_id, Notification.user_id == None)
             )
 
-        notifications = query.all()
-        for n in notifications:
-            n.mark_read()
+        # One UPDATE instead of loading and flushing every row
+        count = query.update(
+            {Notification.is_read: True, Notification.read_at: datetime.utcnow()},
+            synchronize_session=False
+        )
 
         db.session.commit()
-        return len(notifications)
+        return count
 
     @staticmethod
     def dismiss(notification_id: int) -> Optional[Notification]:
@@ -190,12 +196,14 @@ class NotificationService:
                 or_(Notification.user_id == user_id, Notification.user_id == None)
             )
 
-        notifications = query.all()
-        for n in notifications:
-            n.mark_dismissed()
+        # One UPDATE instead of loading and flushing every row
+        count = query.update(
+            {Notification.is_dismissed: True, Notification.dismissed_at: datetime.utcnow()},
+            synchronize_session=False
+        )
 
         db.session.commit()
-        return len(notifications)
+        return count
 
     @staticmethod
     def delete_notification(notification_id: int) -> bool:
@@ -7,7 +7,6 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy import func
 from models import db, Task, Space
-import json
 
 
 class TaskService:
@@ -128,7 +127,8 @@ class TaskService:
         parent_task_id: Optional[int] = None,
         include_subtasks: bool = False,
         top_level_only: bool = True,
-        limit: int = 100
+        limit: int = 100,
+        summary_only: bool = False
     ) -> List[Task]:
         """
         List tasks with optional filters.
@@ -141,11 +141,15 @@ class TaskService:
             include_subtasks: Whether to include subtask data in results
             top_level_only: Only return tasks without parents (default True)
             limit: Maximum number of tasks to return
+            summary_only: Load only the columns used by Task.to_summary
 
         Returns:
             List of Task objects
         """
-        query = Task.query
+        if summary_only:
+            query = Task.query.options(*Task.summary_options())
+        else:
+            query = Task.query_with_subtasks()
 
         if space_id is not None:
             query = query.filter(Task.space_id == space_id)
@@ -308,7 +312,7 @@ class TaskService:
         Returns:
             List of overdue Task objects
         """
-        query = Task.query.filter(
+        query = Task.query_with_subtasks().filter(
             Task.due_date < datetime.utcnow(),
             Task.status != 'completed'
         )
@@ -370,7 +374,7 @@ class TaskService:
         Returns:
             List of subtasks ordered by position
         """
-        return Task.query.filter(
+        return Task.query_with_subtasks().filter(
             Task.parent_task_id == parent_task_id
         ).order_by(Task.position).all()
 
@@ -410,7 +414,7 @@ class TaskService:
         Returns:
             Task dict with subtasks or None
         """
-        task = Task.query.get(task_id)
+        task = Task.query_with_subtasks().get(task_id)
         if not task:
             return None
 
@@ -525,6 +529,7 @@ class TaskService:
             recurrence_type=task.recurrence_type,
             recurrence_interval=task.recurrence_interval,
             recurrence_days=task.recurrence_days,
+            recurrence_days_mask=task.recurrence_days_mask,
             recurrence_end_date=task.recurrence_end_date,
             original_task_id=task.original_task_id or task.id,
             is_recurring_instance=True
@@ -554,7 +559,7 @@ class TaskService:
         Returns:
             List of recurring Task objects
         """
-        query = Task.query.filter(
+        query = Task.query_with_subtasks().filter(
             Task.recurrence_type != None,
             Task.is_recurring_instance == False
         )
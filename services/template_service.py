@@ -6,7 +6,6 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy import func
 from models import db, TaskTemplate, Task, Space
-import json
 
 
 class TaskTemplateService:
@@ -115,7 +114,8 @@ class TaskTemplateService:
         category: Optional[str] = None,
         include_global: bool = True,
         active_only: bool = True,
-        limit: int = 100
+        limit: int = 100,
+        summary_only: bool = False
     ) -> List[TaskTemplate]:
         """
         List templates with optional filters.
@@ -126,11 +126,14 @@ class TaskTemplateService:
             include_global: Include global templates in results
             active_only: Only return active templates
             limit: Maximum templates to return
+            summary_only: Load only the columns used by TaskTemplate.to_summary
 
         Returns:
             List of TaskTemplate objects
         """
         query = TaskTemplate.query
+        if summary_only:
+            query = query.options(*TaskTemplate.summary_options())
 
         if active_only:
             query = query.filter(TaskTemplate.is_active == True)
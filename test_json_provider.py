@@ -0,0 +1,64 @@
+"""
+Test Cleo JSON Provider
+Checks that the orjson-backed provider renders responses like Flask's
+default provider (apart from non-ASCII text, which it sends as UTF-8)
+Run with: python -m pytest test_json_provider.py
+"""
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app import OrjsonProvider
+
+SAMPLES = [
+    {'b': 1, 'a': [1.5, None, True], 'c': {'z': 'x', 'y': ''}},
+    {'created_at': datetime(2026, 1, 5, 9, 30, 15), 'day': date(2026, 1, 5)},
+    {'aware': datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc)},
+    {'price': Decimal('19.990'), 'ratio': Decimal('1E-7')},
+    {'id': uuid.UUID('12345678-1234-5678-1234-567812345678')},
+    {1: 'one', 2: 'two'},
+    [{'nested': [datetime(2026, 12, 31, 23, 59, 59)]}],
+    'plain string',
+    None,
+]
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture
+def providers(app):
+    # Providers only hold a weak reference to the app
+    return OrjsonProvider(app), DefaultJSONProvider(app)
+
+
+@pytest.mark.parametrize('obj', SAMPLES)
+def test_compact_dumps_matches_default_provider(providers, obj):
+    fast, default = providers
+    assert fast.dumps(obj, separators=(',', ':')) == default.dumps(obj, separators=(',', ':'))
+
+
+@pytest.mark.parametrize('obj', SAMPLES)
+def test_response_matches_default_provider(app, providers, obj):
+    fast, default = providers
+    with app.test_request_context():
+        assert fast.response(obj).get_data() == default.response(obj).get_data()
+
+
+def test_datetime_and_decimal_use_flask_default(providers):
+    fast, _ = providers
+    assert fast.dumps({'at': datetime(2026, 1, 5, 9, 30)}) == '{"at":"Mon, 05 Jan 2026 09:30:00 GMT"}'
+    assert fast.dumps({'price': Decimal('19.990')}) == '{"price":"19.990"}'
+
+
+def test_custom_options_fall_back_to_stdlib(providers):
+    fast, default = providers
+    obj = {'b': datetime(2026, 1, 5), 'a': 'é'}
+    assert fast.dumps(obj, indent=2) == default.dumps(obj, indent=2)
+    assert fast.loads('{"a": [1, 2]}') == {'a': [1, 2]}
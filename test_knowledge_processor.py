@@ -0,0 +1,109 @@
+"""
+Test Knowledge Processor Text Handling
+Checks the optimized text cleanup and relation extraction against
+reference regex implementations
+Run with: python -m pytest test_knowledge_processor.py
+"""
+import re
+import zipfile
+
+import pytest
+
+from knowledge_processor import KnowledgeProcessor, _iter_docx_paragraphs
+
+processor = KnowledgeProcessor()
+
+SAMPLES = [
+    '',
+    '   ',
+    'plain',
+    '  a  b \n c\n\n\n  d  \r\n e ',
+    'Line one.\n\nLine two.\n\n\n\nLine three.',
+    '\n\n  leading and trailing blank lines  \n \n',
+    'tabs\tand\vform\ffeeds\x1c\x1d\x1e\x1f',
+    'unicode\u00a0no-break\u2003em\u3000ideographic\u2028line\u2029para\u0085next',
+    'windows\r\nline\r\n\r\nendings\r\n',
+]
+
+
+def reference_clean_text(text):
+    """Regex cleanup keeping line breaks, with each line's edges trimmed"""
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r' *\n *', '\n', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def baseline_clean_text(text):
+    """Original regex cleanup, which collapsed line breaks too"""
+    return re.sub(r'\n\n+', '\n\n', re.sub(r'\s+', ' ', text)).strip()
+
+
+def test_clean_text_matches_reference():
+    for text in SAMPLES:
+        assert processor._clean_text(text) == reference_clean_text(text), repr(text)
+
+
+def test_clean_text_strips_lines_and_keeps_paragraphs():
+    assert processor._clean_text('  a  b \n c\n\n\n  d  \r\n e ') == 'a b\nc\n\nd\ne'
+
+
+def test_clean_text_single_line_matches_baseline():
+    for text in SAMPLES:
+        if '\n' not in text:
+            assert processor._clean_text(text) == baseline_clean_text(text), repr(text)
+
+
+def baseline_extract_relations(text, entities):
+    """Original extract_relations: substring scan of each sentence"""
+    relations = []
+    entity_names = [e['name'] for e in entities]
+    for sentence in re.split(r'[.!?]', text):
+        entities_in_sentence = [e for e in entity_names if e in sentence]
+        for i, source in enumerate(entities_in_sentence):
+            for target in entities_in_sentence[i+1:]:
+                relations.append({'source': source, 'target': target,
+                                  'type': 'mentioned_with', 'confidence': 0.5})
+    return relations
+
+
+@pytest.mark.parametrize('use_ahocorasick', [True, False])
+def test_extract_relations_matches_baseline(monkeypatch, use_ahocorasick):
+    import random
+    import knowledge_processor
+
+    if not use_ahocorasick:
+        monkeypatch.setattr(knowledge_processor, 'ahocorasick', None)
+    elif knowledge_processor.ahocorasick is None:
+        pytest.skip('pyahocorasick not installed')
+
+    rng = random.Random(1234)
+    names = ['Ada Lovelace', 'Lovelace Labs', 'Ada', 'Charles Babbage',
+             'Babbage', 'London Office', 'Office']
+    words = names + ['met', 'in', 'the', 'and', 'wrote', 'to']
+    for _ in range(200):
+        text = ' '.join(
+            rng.choice(words) + rng.choice(['', '', '', '.', '!', '?'])
+            for _ in range(rng.randint(0, 40))
+        )
+        entities = [{'name': name} for name in rng.sample(names, rng.randint(0, len(names)))]
+        assert processor.extract_relations(text, entities) == \
+            baseline_extract_relations(text, entities), (text, entities)
+
+
+DOCX_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/><w:tab w:val="right" w:pos="9000"/>'
+    '</w:tabs></w:pPr><w:r><w:t>Name</w:t><w:tab/><w:t>Value</w:t></w:r></w:p>'
+    '<w:p><w:r><w:t xml:space="preserve">Line </w:t><w:br/><w:t>two</w:t></w:r>'
+    '<w:hyperlink><w:r><w:t> link</w:t></w:r></w:hyperlink></w:p>'
+    '<w:p/>'
+    '</w:body></w:document>'
+)
+
+
+def test_docx_paragraphs_skip_tab_stop_definitions(tmp_path):
+    path = tmp_path / 'sample.docx'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', DOCX_XML)
+
+    assert list(_iter_docx_paragraphs(path)) == ['Name\tValue', 'Line \ntwo link', '']
@@ -0,0 +1,268 @@
+"""
+Test Cleo Database Models
+Checks model helpers against an in-memory SQLite database
+Run with: python -m pytest test_models.py
+"""
+from datetime import datetime
+
+import pytest
+from flask import Flask, current_app, g
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from models import (
+    db, report_lazy_loads, Space, Message, Document, DocumentChunk, Entity, EntityChunk, Relation, RelationChunk,
+    Task, TaskTemplate, CalendarEvent
+)
+
+
+@pytest.fixture
+def session():
+    """Fresh in-memory database per test"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield db.session
+        db.session.remove()
+
+
+def make_document(session, chunk_count=0):
+    """Add a document with chunk_count chunks, returning (document, chunk ids)"""
+    document = Document(name='doc.txt', file_path='/tmp/doc.txt')
+    session.add(document)
+    session.flush()
+    chunk_ids = DocumentChunk.bulk_create([
+        {'document_id': document.id, 'chunk_index': i, 'content': f'chunk {i}'}
+        for i in range(chunk_count)
+    ], return_ids=True)
+    return document, chunk_ids
+
+
+def test_bulk_create_returns_ids_in_input_order(session, monkeypatch):
+    import models
+
+    # Several RETURNING batches, with names that sort differently from input
+    monkeypatch.setattr(models, 'BULK_INSERT_BATCH_SIZE', 3)
+    names = [f'entity-{n}' for n in (7, 2, 9, 0, 5, 3, 8, 1)]
+    ids = Entity.bulk_create([{'name': name} for name in names], return_ids=True)
+
+    assert len(ids) == len(set(ids)) == len(names)
+    assert [session.get(Entity, entity_id).name for entity_id in ids] == names
+
+
+def test_bulk_create_counts_rows_and_encodes_json(session):
+    inserted = Entity.bulk_create([
+        {'name': 'a', 'properties': {'k': [1, 2]}},
+        {'name': 'b', 'properties': '{"raw": true}'},
+        {'name': 'c'},
+    ])
+
+    assert inserted == 3
+    by_name = {entity.name: entity for entity in Entity.query.all()}
+    assert by_name['a'].get_properties() == {'k': [1, 2]}
+    assert by_name['b'].get_properties() == {'raw': True}
+    assert by_name['c'].get_properties() == {}
+
+
+def test_bulk_create_empty(session):
+    assert Entity.bulk_create([], return_ids=True) == []
+    assert Entity.bulk_create([]) == 0
+
+
+@pytest.mark.parametrize('days, expected', [
+    ([], []),
+    ([0], [0]),
+    ([6], [6]),
+    ([4, 0, 2], [0, 2, 4]),
+    ([1, 1, '3'], [1, 3]),
+    (list(range(7)), list(range(7))),
+])
+def test_recurrence_days_round_trip_through_mask(session, days, expected):
+    space = Space(name='Home')
+    session.add(space)
+    session.flush()
+    task = Task(space_id=space.id, title='Standup')
+    template = TaskTemplate(name='Standup', title_template='Standup')
+    task.set_recurrence_days(days)
+    template.set_recurrence_days(days)
+    session.add_all([task, template])
+    session.commit()
+    session.expire_all()
+
+    assert task.get_recurrence_days() == expected
+    assert template.get_recurrence_days() == expected
+    assert task.recurrence_days_mask == sum(1 << day for day in expected)
+    assert task.recurrence_days is None
+
+
+def test_recurrence_days_fall_back_to_legacy_json(session):
+    task = Task(title='Legacy', recurrence_days='[2, 5]')
+    template = TaskTemplate(name='Legacy', title_template='Legacy', default_recurrence_days='[1]')
+
+    assert task.get_recurrence_days() == [2, 5]
+    assert template.get_recurrence_days() == [1]
+
+    task.set_recurrence_days([3])
+    assert task.get_recurrence_days() == [3]
+    assert task.recurrence_days is None
+
+
+def baseline_format_file_size(size):
+    """Original Document.format_file_size (divide-by-1024 loop)"""
+    if not size:
+        return "Unknown"
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+def test_format_file_size_matches_baseline():
+    sizes = [None, 0, 1, 1023, 1024, 1025, 1048575, 1048576, 5 * 1024 ** 3 + 7,
+             1024 ** 4 - 1, 1024 ** 4, 3 * 1024 ** 5]
+    sizes += [(1 << bits) + delta for bits in range(1, 50) for delta in (-1, 0, 1)]
+    for size in sizes:
+        document = Document(file_size=size)
+        assert document.format_file_size() == baseline_format_file_size(size), size
+        assert document.file_size == size
+
+
+def test_json_doc_columns_round_trip(session):
+    space = Space(name='Home')
+    session.add(space)
+    session.flush()
+    message = Message(space_id=space.id, role='user', author='me', content='hi')
+    message.set_mentions(['researcher', 'writer'])
+    message.set_citations([{'document': 'doc.txt', 'score': 0.5}])
+    event = CalendarEvent(title='Review', start_time=datetime(2026, 1, 5, 9),
+                          end_time=datetime(2026, 1, 5, 10))
+    event.set_reminder_minutes([5, 60])
+    event.set_attendees([{'email': 'a@example.com', 'status': 'accepted'}])
+    session.add_all([message, event])
+    session.commit()
+    session.expire_all()
+
+    assert message.get_mentions() == ['researcher', 'writer']
+    assert message.get_citations() == [{'document': 'doc.txt', 'score': 0.5}]
+    assert event.get_reminder_minutes() == [5, 60]
+    assert event.get_attendees() == [{'email': 'a@example.com', 'status': 'accepted'}]
+
+
+def test_json_doc_getters_default_and_copy(session):
+    message = Message(role='user', author='me', content='hi')
+    event = CalendarEvent(title='Review')
+    assert message.get_mentions() == []
+    assert message.get_citations() == []
+    assert event.get_reminder_minutes() == [15]
+    assert event.get_attendees() == []
+
+    message.set_mentions(['researcher'])
+    message.get_mentions().append('writer')
+    assert message.get_mentions() == ['researcher']
+
+    # None is stored as SQL NULL, not a JSON null, so the default applies
+    space = Space(name='Home')
+    session.add(space)
+    session.flush()
+    message.space_id = space.id
+    message.set_mentions(None)
+    session.add(message)
+    session.commit()
+    assert Message.query.filter(Message.mentions.is_(None)).count() == 1
+    assert message.get_mentions() == []
+
+
+def test_json_doc_columns_are_jsonb_on_postgresql():
+    dialect = postgresql.dialect()
+    message_ddl = str(CreateTable(Message.__table__).compile(dialect=dialect))
+    event_ddl = str(CreateTable(CalendarEvent.__table__).compile(dialect=dialect))
+
+    assert 'mentions JSONB' in message_ddl
+    assert 'citations JSONB' in message_ddl
+    assert 'reminder_minutes JSONB' in event_ddl
+    assert 'attendees JSONB' in event_ddl
+
+
+def test_source_chunks_keep_order_and_reuse_links(session):
+    document, chunk_ids = make_document(session, 4)
+    a, b, c, d = chunk_ids
+    entity = Entity(name='Ada')
+    entity.set_source_chunks([c, a, str(d), c])
+    session.add(entity)
+    session.commit()
+    session.expire_all()
+
+    assert entity.get_source_chunks() == [c, a, d]
+
+    # Chunks that stay linked keep their rows, with updated positions
+    kept = {link.chunk_id: link for link in entity.chunk_links}
+    entity.set_source_chunks([d, b, c])
+    assert entity.chunk_links[0] is kept[d]
+    assert entity.chunk_links[2] is kept[c]
+    session.commit()
+    session.expire_all()
+
+    assert entity.get_source_chunks() == [d, b, c]
+    assert [link.position for link in entity.chunk_links] == [0, 1, 2]
+    assert EntityChunk.query.filter_by(entity_id=entity.id, chunk_id=a).count() == 0
+
+
+def test_source_chunk_lookups(session):
+    document, chunk_ids = make_document(session, 3)
+    other, other_ids = make_document(session, 1)
+    ada, babbage = Entity(name='Ada'), Entity(name='Babbage')
+    ada.set_source_chunks([chunk_ids[0], chunk_ids[2]])
+    babbage.set_source_chunks([other_ids[0]])
+    session.add_all([ada, babbage])
+    session.flush()
+    relation = Relation(source_entity_id=ada.id, target_entity_id=babbage.id,
+                        relation_type='mentioned_with')
+    relation.set_source_chunks([chunk_ids[2]])
+    session.add(relation)
+    session.commit()
+
+    assert Entity.citing_chunk(chunk_ids[2]) == [ada]
+    assert Entity.citing_chunk(chunk_ids[1]) == []
+    assert Entity.in_document(document.id) == [ada]
+    assert Entity.in_document(other.id) == [babbage]
+    assert Relation.citing_chunk(chunk_ids[2]) == [relation]
+    assert relation.get_source_chunks() == [chunk_ids[2]]
+
+
+def test_source_chunk_links_are_deleted_with_owner(session):
+    document, chunk_ids = make_document(session, 2)
+    ada, babbage = Entity(name='Ada'), Entity(name='Babbage')
+    ada.set_source_chunks(chunk_ids)
+    session.add_all([ada, babbage])
+    session.flush()
+    relation = Relation(source_entity_id=ada.id, target_entity_id=babbage.id,
+                        relation_type='mentioned_with')
+    relation.set_source_chunks(chunk_ids)
+    session.add(relation)
+    session.commit()
+
+    session.delete(ada)
+    session.commit()
+
+    assert EntityChunk.query.count() == 0
+    assert RelationChunk.query.count() == 0
+
+
+def test_report_lazy_loads_ignores_bulk_writes(session):
+    app = current_app._get_current_object()
+    report_lazy_loads(app)
+    document, chunk_ids = make_document(session, 2)
+    entity = Entity(name='Ada')
+    entity.set_source_chunks(chunk_ids)
+    session.add(entity)
+    session.commit()
+    session.expire_all()
+
+    with app.test_request_context('/documents'):
+        # ORM INSERT ... RETURNING, then a lazy load that gets counted
+        assert len(Entity.bulk_create([{'name': 'Babbage'}], return_ids=True)) == 1
+        assert entity.get_source_chunks() == chunk_ids
+        assert g._lazy_loads == {'Entity -> EntityChunk': 1}
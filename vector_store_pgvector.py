@@ -8,6 +8,7 @@ providing a unified database for both relational and vector data.
 
 import os
 import logging
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Tuple
 from functools import lru_cache
 import numpy as np
@@ -24,8 +25,14 @@ class PgVectorStore:
     - HNSW indexing for fast approximate nearest neighbor
     - Integrated with SQLAlchemy ORM
     - Caching for query embeddings
+    - Caching of search results for repeated queries (EmbeddingQueryCache)
     """
 
+    # Search results are reused for this long after they were computed
+    QUERY_CACHE_TTL = timedelta(minutes=10)
+    # Rows kept in embedding_query_cache; least recently used are evicted
+    QUERY_CACHE_MAX_ROWS = 1000
+
     def __init__(self, db_session, embedding_model: str = "all-MiniLM-L6-v2"):
         """
         Initialize PgVectorStore.
@@ -138,7 +145,7 @@ class PgVectorStore:
                 # Update chunk with embedding
                 self.db.execute(text("""
                     UPDATE document_chunks
-                    SET embedding_vector = :embedding::vector
+                    SET embedding_vector = CAST(:embedding AS vector)
                     WHERE document_id = :doc_id AND chunk_index = :idx
                 """), {
                     'embedding': embedding_str,
@@ -146,6 +153,7 @@ class PgVectorStore:
                     'idx': chunk['chunk_index']
                 })
 
+            self._clear_query_cache()
             self.db.commit()
             logger.info(f"Added {len(chunks)} chunks for document {document_id}")
             return True
@@ -181,6 +189,15 @@ class PgVectorStore:
             logger.warning("Failed to generate query embedding")
             return []
 
+        from models import EmbeddingQueryCache
+
+        query_hash = EmbeddingQueryCache.make_hash(
+            query_embedding, n_results, sorted(document_ids or ()), min_similarity
+        )
+        cached = self._get_cached_results(query_hash)
+        if cached is not None:
+            return cached
+
         # Convert to PostgreSQL vector format
         embedding_str = f"[{','.join(map(str, query_embedding))}]"
 
@@ -203,41 +220,166 @@ class PgVectorStore:
                 }
 
             # Query with cosine similarity
-            # Note: pgvector uses <=> for cosine distance, so similarity = 1 - distance
+            # Note: pgvector uses <=> for cosine distance, so similarity = 1 - distance.
+            # The inner query is a plain ORDER BY distance LIMIT k, which the
+            # HNSW index (idx_document_chunks_embedding_hnsw) serves directly;
+            # the similarity threshold is applied to those k rows afterwards.
+            # CAST(... AS vector) rather than ::vector, which text() would
+            # not recognise as a bind parameter.
             results = self.db.execute(text(f"""
-                SELECT
-                    dc.id,
-                    dc.content,
-                    dc.document_id,
-                    dc.chunk_index,
-                    dc.token_count,
-                    d.filename,
-                    d.title,
-                    1 - (dc.embedding_vector <=> :query_vec::vector) as similarity
-                FROM document_chunks dc
-                JOIN documents d ON d.id = dc.document_id
-                WHERE dc.embedding_vector IS NOT NULL
-                {doc_filter}
-                AND 1 - (dc.embedding_vector <=> :query_vec::vector) >= :min_sim
-                ORDER BY dc.embedding_vector <=> :query_vec::vector
-                LIMIT :limit
+                SELECT nearest.*, 1 - nearest.distance AS similarity
+                FROM (
+                    SELECT
+                        dc.id,
+                        dc.content,
+                        dc.document_id,
+                        dc.chunk_index,
+                        dc.token_count,
+                        d.filename,
+                        d.title,
+                        dc.embedding_vector <=> CAST(:query_vec AS vector) AS distance
+                    FROM document_chunks dc
+                    JOIN documents d ON d.id = dc.document_id
+                    WHERE dc.embedding_vector IS NOT NULL
+                    {doc_filter}
+                    ORDER BY distance
+                    LIMIT :limit
+                ) nearest
+                WHERE 1 - nearest.distance >= :min_sim
+                ORDER BY nearest.distance
             """), params)
 
-            return [{
-                'id': row.id,
-                'content': row.content,
-                'document_id': row.document_id,
-                'chunk_index': row.chunk_index,
-                'token_count': row.token_count,
-                'filename': row.filename,
-                'document_title': row.title,
-                'similarity': float(row.similarity)
-            } for row in results]
+            results = [self._search_result(row, row.similarity) for row in results]
 
         except Exception as e:
             logger.error(f"Error in vector search: {e}")
             return []
 
+        self._cache_results(query_hash, results)
+        return results
+
+    @staticmethod
+    def _search_result(row, similarity: float) -> Dict[str, Any]:
+        """Build a search result dict from a chunk/document row"""
+        return {
+            'id': row.id,
+            'content': row.content,
+            'document_id': row.document_id,
+            'chunk_index': row.chunk_index,
+            'token_count': row.token_count,
+            'filename': row.filename,
+            'document_title': row.title,
+            'similarity': float(similarity)
+        }
+
+    def _get_cached_results(self, query_hash: bytes) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached search results for query_hash, or None on a miss.
+
+        A hit re-reads the chunks by primary key instead of running the
+        nearest-neighbour search. Entries older than QUERY_CACHE_TTL, or
+        pointing at chunks that no longer exist, count as misses.
+
+        The cache is read and its hit counters updated in a transaction on
+        a separate connection, so a search never commits or rolls back
+        the caller's session.
+        """
+        from sqlalchemy import text, select, update, func
+        from models import EmbeddingQueryCache
+
+        cache = EmbeddingQueryCache.__table__
+        try:
+            with self.db.get_bind().begin() as conn:
+                entry = conn.execute(
+                    select(cache.c.results, cache.c.created_at).where(cache.c.query_hash == query_hash)
+                ).first()
+                if entry is None or entry.created_at < datetime.utcnow() - self.QUERY_CACHE_TTL:
+                    return None
+
+                pairs = EmbeddingQueryCache.decode_results(entry.results)
+                rows = {}
+                if pairs:
+                    rows = {row.id: row for row in conn.execute(text("""
+                        SELECT
+                            dc.id,
+                            dc.content,
+                            dc.document_id,
+                            dc.chunk_index,
+                            dc.token_count,
+                            d.filename,
+                            d.title
+                        FROM document_chunks dc
+                        JOIN documents d ON d.id = dc.document_id
+                        WHERE dc.id = ANY(:ids)
+                    """), {'ids': [chunk_id for chunk_id, _ in pairs]})}
+                    if len(rows) != len(pairs):
+                        return None
+
+                conn.execute(
+                    update(cache)
+                    .where(cache.c.query_hash == query_hash)
+                    .values(hit_count=func.coalesce(cache.c.hit_count, 0) + 1,
+                            last_used_at=datetime.utcnow())
+                )
+
+            return [self._search_result(rows[chunk_id], similarity) for chunk_id, similarity in pairs]
+
+        except Exception as e:
+            logger.warning(f"Error reading search cache: {e}")
+            return None
+
+    def _cache_results(self, query_hash: bytes, results: List[Dict[str, Any]]):
+        """
+        Store search results for query_hash and evict least recently used entries
+
+        Runs on its own connection (see _get_cached_results). Concurrent
+        misses on the same query_hash upsert instead of racing on the
+        unique key; the last writer's results win.
+        """
+        from sqlalchemy import select, delete
+        from sqlalchemy.dialects.postgresql import insert
+        from models import EmbeddingQueryCache
+
+        cache = EmbeddingQueryCache.__table__
+        try:
+            now = datetime.utcnow()
+            encoded = EmbeddingQueryCache.encode_results((r['id'], r['similarity']) for r in results)
+            with self.db.get_bind().begin() as conn:
+                stmt = insert(cache).values(
+                    query_hash=query_hash,
+                    results=encoded,
+                    hit_count=0,
+                    created_at=now,
+                    last_used_at=now,
+                )
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=[cache.c.query_hash],
+                    set_={
+                        'results': stmt.excluded.results,
+                        'created_at': stmt.excluded.created_at,
+                        'last_used_at': stmt.excluded.last_used_at,
+                    },
+                ))
+
+                # Everything not among the QUERY_CACHE_MAX_ROWS most recently used
+                cutoff = conn.execute(
+                    select(cache.c.last_used_at)
+                    .order_by(cache.c.last_used_at.desc())
+                    .offset(self.QUERY_CACHE_MAX_ROWS)
+                    .limit(1)
+                ).scalar()
+                if cutoff is not None:
+                    conn.execute(delete(cache).where(cache.c.last_used_at <= cutoff))
+
+        except Exception as e:
+            logger.warning(f"Error writing search cache: {e}")
+
+    def _clear_query_cache(self):
+        """Drop cached search results (call when chunk embeddings change)"""
+        from models import EmbeddingQueryCache
+
+        self.db.query(EmbeddingQueryCache).delete(synchronize_session=False)
+
     def search_with_metadata(
         self,
         query: str,
@@ -277,6 +419,7 @@ class PgVectorStore:
                 SET embedding_vector = NULL
                 WHERE document_id = :doc_id
             """), {'doc_id': document_id})
+            self._clear_query_cache()
             self.db.commit()
             logger.info(f"Deleted embeddings for document {document_id}")
             return True
@@ -332,7 +475,7 @@ class PgVectorStore:
                         embedding_str = f"[{','.join(map(str, embedding))}]"
                         self.db.execute(text("""
                             UPDATE document_chunks
-                            SET embedding_vector = :embedding::vector
+                            SET embedding_vector = CAST(:embedding AS vector)
                             WHERE id = :chunk_id
                         """), {
                             'embedding': embedding_str,
@@ -340,6 +483,7 @@ class PgVectorStore:
                         })
                         processed += 1
 
+                self._clear_query_cache()
                 self.db.commit()
                 logger.info(f"Processed {processed} chunks...")
 
@@ -385,11 +529,11 @@ class PgVectorStore:
                     dc.id,
                     dc.content,
                     dc.document_id,
-                    1 - (dc.embedding_vector <=> :ref_embedding) as similarity
+                    1 - (dc.embedding_vector <=> CAST(:ref_embedding AS vector)) as similarity
                 FROM document_chunks dc
                 WHERE dc.id != :chunk_id
                 AND dc.embedding_vector IS NOT NULL
-                ORDER BY dc.embedding_vector <=> :ref_embedding
+                ORDER BY dc.embedding_vector <=> CAST(:ref_embedding AS vector)
                 LIMIT :limit
             """), {
                 'chunk_id': chunk_id,
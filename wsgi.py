@@ -16,7 +16,7 @@ def initialize_database():
 
         # Seed agents if database is empty
         from models import Agent
-        if Agent.query.count() == 0:
+        if db.session.query(Agent.id).first() is None:
             logger.info("Database is empty, seeding agents...")
             seed_agents()
 